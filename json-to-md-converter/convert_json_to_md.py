@@ -1,108 +1,202 @@
 import json
 import os
+from itertools import chain
+
+try:
+    import ijson
+except ImportError:  # Optional: without it the whole file is loaded at once
+    ijson = None
+
+TABLE_HEADER = "| Name | Default |\n| :--- | :--- |\n"
 
 def extract_value(var_data):
-    if not isinstance(var_data, dict):
+    # Nearly every token is a dict with a populated $value, so try that first
+    try:
+        val = var_data["$value"]
+    except KeyError:
+        val = ""
+    except TypeError:
         return str(var_data)
     
-    val = var_data.get("$value", "")
     if val == "" and "$alias" in var_data:
         return f"Alias: {var_data['$alias']}"
     return str(val)
 
-def walk(node, path_components):
-    tables = []
-    
-    # Identify variables and subgroups in the current node
-    variables = {}
-    subgroups = {}
+def walk(node, path_components=()):
+    # Depth-first traversal with an explicit stack instead of recursion;
+    # paths are tuples so siblings share their parent's components.
+    # Tables are yielded as they are built so callers can write them out
+    # without holding the whole table list
+    stack = [(node, tuple(path_components))]
     
-    # Sort keys to ensure deterministic output order
-    keys = sorted(node.keys())
-    
-    for key in keys:
-        value = node[key]
-        if key.startswith("$"):
-            continue
-            
-        is_variable = False
-        is_group = False
+    while stack:
+        node, path = stack.pop()
+        
+        # Identify variables and subgroups in the current node in one pass.
+        # Sort keys to ensure deterministic output order
+        variables = []
+        subgroups = []
         
-        if isinstance(value, dict):
-            if "$value" in value or "$type" in value:
-                is_variable = True
+        items = sorted(node.items()) if len(node) > 1 else node.items()
+        
+        for key, value in items:
+            if key.startswith("$") or not isinstance(value, dict):
+                continue
+            
+            # Classify the child with a single scan of its keys: it is a
+            # variable if it has $value/$type and a group if it has any
+            # non-metadata children
+            is_variable = False
+            is_group = False
+            for child_key in value:
+                if child_key.startswith("$"):
+                    if child_key == "$value" or child_key == "$type":
+                        is_variable = True
+                else:
+                    is_group = True
+                if is_variable and is_group:
+                    break
             
-            # Check if it has children that are not metadata
-            has_children = any(not k.startswith("$") for k in value.keys())
-            if has_children:
-                is_group = True
+            if is_variable:
+                variables.append((key, value))
+            
+            if is_group:
+                subgroups.append((key, value))
         
-        if is_variable:
-            variables[key] = value
+        # If we have variables at this level, create a table
+        if variables:
+            yield {
+                "title": " / ".join(path),
+                "rows": [(name, extract_value(data)) for name, data in variables]
+            }
         
-        if is_group:
-            subgroups[key] = value
+        # Push subgroups in reverse so they are visited in sorted order
+        for name, data in reversed(subgroups):
+            stack.append((data, path + (name,)))
 
-    # If we have variables at this level, create a table
-    if variables:
-        table_rows = []
-        for name, data in variables.items():
-            val = extract_value(data)
-            table_rows.append((name, val))
-            
-        tables.append({
-            "title": " / ".join(path_components),
-            "rows": table_rows
-        })
+# Objects on the way from a collection to its default-mode variables
+MODES_PATH = ("TailwindCSS", "modes", "Default")
+
+# ijson events that start a value
+VALUE_EVENTS = frozenset({"start_map", "start_array", "string", "number", "boolean", "null"})
+
+def collection_events(f):
+    """Yield the ijson parse events of the exported collection.
+    
+    The export is either a single collection or a list of collections, of
+    which only the first is used.
     
-    # Recurse into subgroups
-    for name, data in subgroups.items():
-        new_path = path_components + [name]
-        tables.extend(walk(data, new_path))
+    Raises:
+        ValueError: If the collection or an object on MODES_PATH is not an object
+    """
+    events = ijson.parse(f, use_float=True)
+    first = next(events, None)
+    root = ""
+    if first and first[1] == "start_array":
+        root = "item"
+        first = next(events, None)
+    if not first or first[1] != "start_map":
+        raise ValueError("the collection is not an object")
+    yield first
+    
+    # Prefixes of the objects on MODES_PATH, which must not hold other values
+    checked = set()
+    path = root
+    for key in MODES_PATH:
+        path = f"{path}.{key}" if path else key
+        checked.add(path)
+    
+    for prefix, event, value in events:
+        if prefix in checked and event in VALUE_EVENTS and event != "start_map":
+            raise ValueError(f"{prefix} is not an object")
+        yield prefix, event, value
+        
+        # Stop at the end of the first collection in a list
+        if root and prefix == root and event == "end_map":
+            return
+
+def stream_tables(input_file):
+    """Build the tables for TailwindCSS.modes.Default with ijson.
+    
+    Top-level groups are parsed and walked one at a time, so only the group
+    currently being processed is held in memory as parsed JSON.
+    
+    Raises:
+        ValueError: If the JSON does not have the expected structure
+    """
+    with open(input_file, 'rb') as f:
+        events = collection_events(f)
+        
+        # Peek at the first event to learn whether the collection is a list item
+        first = next(events)
+        prefix = "TailwindCSS.modes.Default"
+        if first[0] == "item":
+            prefix = "item." + prefix
         
-    return tables
+        root_rows = []
+        group_tables = {}
+        for key, value in ijson.kvitems(chain((first,), events), prefix):
+            tables = list(walk({key: value}))
+            if tables and not tables[0]["title"]:
+                root_rows.extend(tables.pop(0)["rows"])
+            if tables:
+                group_tables[key] = tables
+    
+    # Reassemble in the order walk() produces for the whole tree
+    all_tables = []
+    if root_rows:
+        all_tables.append({"title": "", "rows": sorted(root_rows, key=lambda row: row[0])})
+    for key in sorted(group_tables):
+        all_tables.extend(group_tables[key])
+    return all_tables
 
 def json_to_markdown(input_file, output_file):
-    with open(input_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    if ijson is not None:
+        try:
+            all_tables = stream_tables(input_file)
+        except ValueError:
+            print("Error: unexpected JSON structure.")
+            return
+    else:
+        with open(input_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
 
-    # Access the relevant data structure
-    try:
-        if isinstance(data, list):
-            modes = data[0].get("TailwindCSS", {}).get("modes", {}).get("Default", {})
-        else:
-            modes = data.get("TailwindCSS", {}).get("modes", {}).get("Default", {})
-    except (IndexError, AttributeError):
-        print("Error: unexpected JSON structure.")
-        return
+        # Access the relevant data structure
+        try:
+            if isinstance(data, list):
+                modes = data[0].get("TailwindCSS", {}).get("modes", {}).get("Default", {})
+            else:
+                modes = data.get("TailwindCSS", {}).get("modes", {}).get("Default", {})
+        except (IndexError, AttributeError):
+            print("Error: unexpected JSON structure.")
+            return
 
-    all_tables = walk(modes, [])
+        all_tables = walk(modes)
     
-    markdown_lines = []
-    for table in all_tables:
-        title = table["title"]
-        rows = table["rows"]
-        
-        # Skip empty title if root has no variables (usually root doesn't)
-        if not title:
-            # If root had variables, we'd label it Root, but unlikely here.
-            # If it happens, let's just header it.
-            if rows:
-                markdown_lines.append("### Root Variables\n")
-        else:
-            markdown_lines.append(f"### {title}\n")
-        
-        if rows:
-            markdown_lines.append("| Name | Default |")
-            markdown_lines.append("| :--- | :--- |")
+    # Write each table straight to the output file as it is formatted.
+    # The separator reproduces the blank-line layout of joining all lines
+    with open(output_file, 'w', encoding='utf-8', buffering=1 << 16) as f:
+        separator = ""
+        for table in all_tables:
+            title = table["title"]
+            rows = table["rows"]
             
-            for name, val in rows:
-                markdown_lines.append(f"| {name} | {val} |")
+            # Skip empty title if root has no variables (usually root doesn't)
+            if not title:
+                # If root had variables, we'd label it Root, but unlikely here.
+                # If it happens, let's just header it.
+                if rows:
+                    f.write(f"{separator}### Root Variables\n")
+                    separator = "\n"
+            else:
+                f.write(f"{separator}### {title}\n")
+                separator = "\n"
             
-            markdown_lines.append("") # Empty line
-        
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write("\n".join(markdown_lines))
+            if rows:
+                # Header, rows and trailing empty line in a single write
+                body = "\n".join(f"| {name} | {val} |" for name, val in rows)
+                f.write(f"{separator}{TABLE_HEADER}{body}\n")
+                separator = "\n"
     
     print(f"Successfully created {output_file}")
 
@@ -8,7 +8,6 @@ __version__ = "1.0.0"
 __author__ = "Your Name"
 __email__ = "your.email@example.com"
 
-from .core.converter import MarkdownToPDFConverter
 from .core.exceptions import ConverterError, FileNotFoundError, ConversionError
 
 __all__ = [
@@ -16,4 +15,12 @@ __all__ = [
     "ConverterError",
     "FileNotFoundError", 
     "ConversionError"
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    # The converter pulls in WeasyPrint, so it is only imported on first use
+    if name == "MarkdownToPDFConverter":
+        from .core.converter import MarkdownToPDFConverter
+        return MarkdownToPDFConverter
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,12 +1,15 @@
+from itertools import chain
 from pathlib import Path
-from core.converter import MarkdownToPDFConverter
-from core.utils import find_markdown_files
+import os
+from core.batch import convert_batch
+from core.utils import ensure_directory_exists, find_markdown_files, unique_paths
 
 LIST_FILE = Path(__file__).parent / 'md_dirs.txt'
 DEFAULT_THEME = 'default'
 OUTPUT_DIR = None
 CUSTOM_CSS_FILE = None
 CUSTOM_CSS = None
+FOLLOW_SYMLINKS = False
 
 def iter_dirs(list_file: Path):
     for raw in list_file.read_text(encoding='utf-8').splitlines():
@@ -16,38 +19,32 @@ def iter_dirs(list_file: Path):
         yield Path(line)
 
 def main():
-    converter = MarkdownToPDFConverter()
-    collected = []
-    for d in iter_dirs(LIST_FILE):
-        if d.is_dir():
-            collected.extend(find_markdown_files(str(d), recursive=True))
-    unique = []
-    seen = set()
-    for f in collected:
-        key = Path(f).resolve()
-        if key not in seen:
-            seen.add(key)
-            unique.append(Path(f))
+    unique = unique_paths(chain.from_iterable(
+        find_markdown_files(str(d), recursive=True)
+        for d in iter_dirs(LIST_FILE)
+        if d.is_dir()
+    ), follow_symlinks=FOLLOW_SYMLINKS)
+    if OUTPUT_DIR:
+        ensure_directory_exists(OUTPUT_DIR)
+    jobs = []
+    for md in map(os.fspath, unique):
+        if OUTPUT_DIR:
+            name = os.path.splitext(os.path.basename(md))[0] + '.pdf'
+            out_path = os.path.join(OUTPUT_DIR, name)
+        else:
+            out_path = os.path.splitext(md)[0] + '.pdf'
+        jobs.append((md, out_path))
     success = 0
     fail = 0
-    for md in unique:
-        try:
-            if OUTPUT_DIR:
-                out = Path(OUTPUT_DIR) / md.name
-                out = out.with_suffix('.pdf')
-                out.parent.mkdir(parents=True, exist_ok=True)
-                out_path = str(out)
-            else:
-                out_path = str(md.with_suffix('.pdf'))
-            converter.convert_file(
-                markdown_file_path=str(md),
-                output_pdf_path=out_path,
-                theme=DEFAULT_THEME,
-                custom_css=CUSTOM_CSS,
-                custom_css_file=CUSTOM_CSS_FILE,
-            )
+    for _, _, error in convert_batch(
+        jobs,
+        theme=DEFAULT_THEME,
+        custom_css=CUSTOM_CSS,
+        custom_css_file=CUSTOM_CSS_FILE,
+    ):
+        if error is None:
             success += 1
-        except Exception:
+        else:
             fail += 1
     print(f"Converted: {success}, Failed: {fail}")
 
@@ -1,7 +1,11 @@
+from itertools import chain
 from pathlib import Path
+from typing import Optional
+import fnmatch
 import glob
-from core.converter import MarkdownToPDFConverter
-from core.utils import is_markdown_file, find_markdown_files
+import os
+from core.batch import convert_batch
+from core.utils import ensure_directory_exists, find_markdown_files, is_markdown_file, unique_paths
 
 LIST_FILE = Path(__file__).parent / 'md_paths.txt'
 DEFAULT_THEME = 'default'
@@ -9,6 +13,9 @@ OUTPUT_DIR = None
 RECURSIVE_DIRECTORIES = True
 CUSTOM_CSS_FILE = None
 CUSTOM_CSS = None
+FOLLOW_SYMLINKS = False
+MERGE_OUTPUT = None
+MAX_SPECS = 10000
 
 def iter_specs(list_file: Path):
     for raw in list_file.read_text(encoding='utf-8').splitlines():
@@ -17,49 +24,100 @@ def iter_specs(list_file: Path):
             continue
         yield line
 
-def expand_spec(spec: str, recursive: bool):
+def iter_unique_specs(list_file: Path, limit: int):
+    seen = set()
+    for spec in iter_specs(list_file):
+        key = os.path.normcase(os.path.normpath(spec))
+        if key in seen:
+            continue
+        if len(seen) >= limit:
+            print(f"Warning: only the first {limit} entries of {list_file} are used")
+            return
+        seen.add(key)
+        yield spec
+
+def _list_dir(directory: str, dir_listings: dict):
+    entries = dir_listings.get(directory)
+    if entries is None:
+        try:
+            with os.scandir(directory) as it:
+                entries = list(it)
+        except OSError:
+            entries = []
+        dir_listings[directory] = entries
+    return entries
+
+def expand_spec(spec: str, recursive: bool, dir_listings: Optional[dict] = None):
+    # dir_listings shares directory listings between the specs of one run
+    if dir_listings is None:
+        dir_listings = {}
     if any(ch in spec for ch in ['*', '?']):
-        paths = [Path(p) for p in glob.glob(spec, recursive=True)]
-        return [p for p in paths if p.exists() and is_markdown_file(str(p))]
+        directory, pattern = os.path.split(spec)
+        if '**' not in pattern and not any(ch in directory for ch in ['*', '?']):
+            # Wildcards only in the file name: match against the cached listing
+            return [
+                Path(os.path.join(directory, entry.name))
+                for entry in _list_dir(directory or os.curdir, dir_listings)
+                if fnmatch.fnmatch(entry.name, pattern)
+                and (pattern.startswith('.') or not entry.name.startswith('.'))
+                and is_markdown_file(entry.name)
+                and entry.is_file()
+            ]
+        # Overlapping '**' segments can match the same file more than once;
+        # glob only returns existing paths, so no further stat is needed
+        return [
+            Path(p) for p in dict.fromkeys(glob.glob(spec, recursive=True))
+            if is_markdown_file(p)
+        ]
     p = Path(spec)
+    if p.is_file():
+        return [p] if is_markdown_file(spec) else []
     if p.is_dir():
         return find_markdown_files(str(p), recursive=recursive)
-    if p.is_file() and is_markdown_file(str(p)):
-        return [p]
     return []
 
 def main():
-    converter = MarkdownToPDFConverter()
-    collected = []
-    for spec in iter_specs(LIST_FILE):
-        collected.extend(expand_spec(spec, RECURSIVE_DIRECTORIES))
-    unique = []
-    seen = set()
-    for f in collected:
-        key = Path(f).resolve()
-        if key not in seen:
-            seen.add(key)
-            unique.append(Path(f))
-    success = 0
-    fail = 0
-    for md in unique:
+    # Listings are cached for this run only, so later runs see new files
+    dir_listings = {}
+    unique = unique_paths(chain.from_iterable(
+        expand_spec(spec, RECURSIVE_DIRECTORIES, dir_listings)
+        for spec in iter_unique_specs(LIST_FILE, MAX_SPECS)
+    ), follow_symlinks=FOLLOW_SYMLINKS)
+    if MERGE_OUTPUT and unique:
+        from core.converter import MarkdownToPDFConverter
         try:
-            if OUTPUT_DIR:
-                out = Path(OUTPUT_DIR) / md.name
-                out = out.with_suffix('.pdf')
-                out.parent.mkdir(parents=True, exist_ok=True)
-                out_path = str(out)
-            else:
-                out_path = str(md.with_suffix('.pdf'))
-            converter.convert_file(
-                markdown_file_path=str(md),
-                output_pdf_path=out_path,
+            MarkdownToPDFConverter().convert_files(
+                [str(md) for md in unique],
+                str(MERGE_OUTPUT),
                 theme=DEFAULT_THEME,
                 custom_css=CUSTOM_CSS,
                 custom_css_file=CUSTOM_CSS_FILE,
             )
+            print(f"Merged {len(unique)} file(s) into {MERGE_OUTPUT}")
+        except Exception as e:
+            print(f"Failed to create {MERGE_OUTPUT}: {e}")
+        return
+    if OUTPUT_DIR:
+        ensure_directory_exists(OUTPUT_DIR)
+    jobs = []
+    for md in map(os.fspath, unique):
+        if OUTPUT_DIR:
+            name = os.path.splitext(os.path.basename(md))[0] + '.pdf'
+            out_path = os.path.join(OUTPUT_DIR, name)
+        else:
+            out_path = os.path.splitext(md)[0] + '.pdf'
+        jobs.append((md, out_path))
+    success = 0
+    fail = 0
+    for _, _, error in convert_batch(
+        jobs,
+        theme=DEFAULT_THEME,
+        custom_css=CUSTOM_CSS,
+        custom_css_file=CUSTOM_CSS_FILE,
+    ):
+        if error is None:
             success += 1
-        except Exception:
+        else:
             fail += 1
     print(f"Converted: {success}, Failed: {fail}")
 
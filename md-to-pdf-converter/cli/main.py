@@ -13,7 +13,9 @@ init(autoreset=True)
 # Add the parent directory to the path to import our modules
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from core.converter import MarkdownToPDFConverter
+from core.batch import convert_batch
+from core.html_processor import HTMLProcessor
+from core.utils import ensure_directory_exists, iter_markdown_files
 from core.exceptions import (
     ConverterError,
     FileNotFoundError as ConverterFileNotFoundError,
@@ -57,14 +59,18 @@ def cli():
 @click.option('--custom-css', help='Custom CSS as string')
 @click.option('-v', '--verbose', is_flag=True, help='Enable verbose output')
 @click.option('--preview', is_flag=True, help='Generate HTML preview instead of PDF')
+@click.option('--engine', type=click.Choice(HTMLProcessor.ENGINES), default='markdown2', show_default=True,
+              help='Markdown engine (cmark requires the cmarkgfm package)')
 def convert(input_file: str, output: Optional[str], theme: Optional[str], css: Optional[str], 
-           custom_css: Optional[str], verbose: bool, preview: bool):
+           custom_css: Optional[str], verbose: bool, preview: bool, engine: str):
     """Convert a markdown file to PDF.
     
     INPUT_FILE: Path to the markdown file to convert
     """
     try:
-        converter = MarkdownToPDFConverter()
+        # Imported here so that --help and the listing commands skip loading WeasyPrint
+        from core.converter import MarkdownToPDFConverter
+        converter = MarkdownToPDFConverter(engine=engine)
         
         if verbose:
             print_info(f"Converting: {input_file}")
@@ -79,8 +85,7 @@ def convert(input_file: str, output: Optional[str], theme: Optional[str], css: O
         
         if preview:
             # Generate HTML preview
-            with open(input_file, 'r', encoding='utf-8') as f:
-                markdown_content = f.read()
+            markdown_content = Path(input_file).read_text(encoding='utf-8')
             
             html_content = converter.preview_html(markdown_content, theme or 'default')
             
@@ -133,8 +138,8 @@ def convert(input_file: str, output: Optional[str], theme: Optional[str], css: O
 def themes():
     """List available themes."""
     try:
-        converter = MarkdownToPDFConverter()
-        available_themes = converter.get_available_themes()
+        from core.styling import StyleManager, ThemeManager
+        available_themes = ThemeManager(StyleManager()).list_themes()
         
         print_info("Available themes:")
         for theme_name, description in available_themes.items():
@@ -149,8 +154,8 @@ def themes():
 def extras():
     """List available markdown extras."""
     try:
-        converter = MarkdownToPDFConverter()
-        available_extras = converter.get_available_markdown_extras()
+        from core.html_processor import HTMLProcessor
+        available_extras = HTMLProcessor().get_available_extras()
         
         print_info("Available markdown extras:")
         for extra_name, description in available_extras.items():
@@ -169,21 +174,17 @@ def extras():
 @click.option('--custom-css', help='Custom CSS as string')
 @click.option('-v', '--verbose', is_flag=True, help='Enable verbose output')
 @click.option('--recursive', is_flag=True, help='Process subdirectories recursively')
+@click.option('--engine', type=click.Choice(HTMLProcessor.ENGINES), default='markdown2', show_default=True,
+              help='Markdown engine (cmark requires the cmarkgfm package)')
 def batch(directory: str, output_dir: Optional[str], theme: Optional[str], css: Optional[str],
-         custom_css: Optional[str], verbose: bool, recursive: bool):
+         custom_css: Optional[str], verbose: bool, recursive: bool, engine: str):
     """Convert all markdown files in a directory to PDF.
     
     DIRECTORY: Directory containing markdown files
     """
     try:
-        converter = MarkdownToPDFConverter()
-        
         # Find all markdown files
-        directory_path = Path(directory)
-        if recursive:
-            md_files = list(directory_path.rglob('*.md')) + list(directory_path.rglob('*.markdown'))
-        else:
-            md_files = list(directory_path.glob('*.md')) + list(directory_path.glob('*.markdown'))
+        md_files = list(iter_markdown_files(directory, recursive=recursive))
         
         if not md_files:
             print_warning(f"No markdown files found in {directory}")
@@ -193,41 +194,44 @@ def batch(directory: str, output_dir: Optional[str], theme: Optional[str], css:
         
         # Determine output directory
         if output_dir:
-            output_path = Path(output_dir)
-            output_path.mkdir(parents=True, exist_ok=True)
+            output_path = output_dir
+            os.makedirs(output_path, exist_ok=True)
         else:
-            output_path = directory_path
+            output_path = directory
+        
+        jobs = []
+        for md_file in md_files:
+            # Maintain directory structure in output
+            relative_path = os.path.relpath(md_file, directory)
+            output_file = os.path.join(output_path, os.path.splitext(relative_path)[0] + '.pdf')
+            
+            # Ensure output subdirectory exists
+            ensure_directory_exists(os.path.dirname(output_file))
+            
+            jobs.append((md_file, output_file))
         
         successful_conversions = 0
         failed_conversions = 0
         
-        for md_file in md_files:
-            try:
-                if verbose:
-                    print_info(f"Processing: {md_file.name}")
-                
-                # Maintain directory structure in output
-                relative_path = md_file.relative_to(directory_path)
-                output_file = output_path / relative_path.with_suffix('.pdf')
-                
-                # Ensure output subdirectory exists
-                output_file.parent.mkdir(parents=True, exist_ok=True)
-                
-                converter.convert_file(
-                    markdown_file_path=str(md_file),
-                    output_pdf_path=str(output_file),
-                    theme=theme or 'default',
-                    custom_css=custom_css,
-                    custom_css_file=css
-                )
-                
+        if verbose:
+            for md_file, _ in jobs:
+                print_info(f"Processing: {Path(md_file).name}")
+        
+        # Files are converted in parallel worker processes; report each one as it finishes
+        for md_file, output_file, error in convert_batch(
+            jobs,
+            theme=theme or 'default',
+            custom_css=custom_css,
+            custom_css_file=css,
+            engine=engine
+        ):
+            if error is None:
                 successful_conversions += 1
                 if verbose:
-                    print_success(f"Converted: {md_file.name} -> {output_file.name}")
-            
-            except Exception as e:
+                    print_success(f"Converted: {Path(md_file).name} -> {Path(output_file).name}")
+            else:
                 failed_conversions += 1
-                print_error(f"Failed to convert {md_file.name}: {e}")
+                print_error(f"Failed to convert {Path(md_file).name}: {error}")
         
         # Summary
         print_info(f"Conversion complete: {successful_conversions} successful, {failed_conversions} failed")
@@ -243,16 +247,18 @@ def batch(directory: str, output_dir: Optional[str], theme: Optional[str], css:
 @cli.command()
 @click.argument('markdown_file', type=click.Path(exists=True, dir_okay=False))
 @click.option('-t', '--theme', help='Theme to use for preview (optional, defaults to Manrope)')
-def preview(markdown_file: str, theme: Optional[str]):
+@click.option('--engine', type=click.Choice(HTMLProcessor.ENGINES), default='markdown2', show_default=True,
+              help='Markdown engine (cmark requires the cmarkgfm package)')
+def preview(markdown_file: str, theme: Optional[str], engine: str):
     """Generate an HTML preview of a markdown file.
     
     MARKDOWN_FILE: Path to the markdown file to preview
     """
     try:
-        converter = MarkdownToPDFConverter()
+        from core.converter import MarkdownToPDFConverter
+        converter = MarkdownToPDFConverter(engine=engine)
         
-        with open(markdown_file, 'r', encoding='utf-8') as f:
-            markdown_content = f.read()
+        markdown_content = Path(markdown_file).read_text(encoding='utf-8')
         
         html_content = converter.preview_html(markdown_content, theme)
         
@@ -0,0 +1,94 @@
+"""Parallel batch conversion of many markdown files."""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterable, Iterator, Optional, Tuple
+
+# Converters owned by the current worker process by markdown engine (built lazily on first use)
+_worker_converters = {}
+
+
+def _get_worker_converter(engine: str):
+    """Get the converter for the current process, creating it if necessary."""
+    converter = _worker_converters.get(engine)
+    if converter is None:
+        # Imported here so that WeasyPrint and its FontConfiguration are
+        # initialized inside each worker rather than inherited from the parent
+        from .converter import MarkdownToPDFConverter
+        converter = _worker_converters[engine] = MarkdownToPDFConverter(engine=engine)
+    return converter
+
+
+def _convert_one(markdown_file_path: str,
+                 output_pdf_path: str,
+                 theme: str,
+                 custom_css: Optional[str],
+                 custom_css_file: Optional[str],
+                 engine: str) -> Optional[str]:
+    """Convert a single file to PDF inside a worker process.
+    
+    The worker writes the PDF itself, so only the status travels back to
+    the calling process.
+    
+    Returns:
+        None on success, otherwise the error message
+    """
+    try:
+        _get_worker_converter(engine).convert_file(
+            markdown_file_path,
+            output_pdf_path,
+            theme=theme,
+            custom_css=custom_css,
+            custom_css_file=custom_css_file
+        )
+        return None
+    except Exception as e:
+        return str(e)
+
+
+def convert_batch(jobs: Iterable[Tuple[str, str]],
+                  theme: str = 'default',
+                  custom_css: Optional[str] = None,
+                  custom_css_file: Optional[str] = None,
+                  max_workers: Optional[int] = None,
+                  engine: str = 'markdown2') -> Iterator[Tuple[str, str, Optional[str]]]:
+    """Convert many markdown files to PDF using a pool of worker processes.
+    
+    Each worker renders and writes its own PDFs. Outputs are replaced
+    atomically, so jobs sharing an output path leave one complete file
+    behind (the last one written) rather than a mix of both.
+    
+    Args:
+        jobs: Iterable of (markdown_file_path, output_pdf_path) pairs
+        theme: Theme name to use for styling
+        custom_css: Custom CSS content as string
+        custom_css_file: Path to custom CSS file
+        max_workers: Maximum number of worker processes (defaults to CPU count)
+        engine: Markdown engine, see HTMLProcessor
+        
+    Yields:
+        (markdown_file_path, output_pdf_path, error) tuples in the order the
+        conversions finish, where error is None for successful conversions
+    """
+    jobs = list(jobs)
+    if not jobs:
+        return
+    
+    workers = min(len(jobs), max_workers or os.cpu_count() or 1)
+    
+    if workers == 1:
+        # Not worth spawning a pool for a single file or a single core
+        for md_path, pdf_path in jobs:
+            yield md_path, pdf_path, _convert_one(md_path, pdf_path, theme, custom_css, custom_css_file, engine)
+        return
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Per-file cost varies a lot, so hand out one file at a time and
+        # report each as soon as it is done rather than waiting on slow ones
+        futures = {
+            executor.submit(_convert_one, md_path, pdf_path, theme, custom_css, custom_css_file, engine): (md_path, pdf_path)
+            for md_path, pdf_path in jobs
+        }
+        for future in as_completed(futures):
+            md_path, pdf_path = futures[future]
+            yield md_path, pdf_path, future.result()
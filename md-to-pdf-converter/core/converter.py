@@ -1,33 +1,77 @@
 """Main converter class for markdown to PDF conversion."""
 
+import html
 import os
+import re
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from weasyprint import HTML, CSS
 from weasyprint.text.fonts import FontConfiguration
 
 from .html_processor import HTMLProcessor
 from .styling import StyleManager, ThemeManager
+from .utils import ensure_directory_exists
 from .exceptions import (
     ConversionError, 
     FileNotFoundError as ConverterFileNotFoundError,
     StyleError
 )
 
+# Start of an id attribute or a same-document link, up to the opening quote
+_ID_REFERENCE_RE = re.compile(r'\s(?:id="|href="#)')
+
+# Number of parsed stylesheets each converter keeps
+_STYLESHEET_CACHE_SIZE = 32
+
 
 class MarkdownToPDFConverter:
     """Main converter class for converting markdown documents to PDF."""
     
-    def __init__(self, markdown_extras: Optional[list] = None):
+    # Wraps each document when several files are merged into one PDF; the
+    # page breaks between them come from the section rules in the default CSS
+    _MERGED_DOCUMENT_TEMPLATE = '<section class="merged-document">\n{body}\n</section>'
+    
+    # HTML preview skeleton with the theme CSS inlined
+    _PREVIEW_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{title}</title>
+    <style>
+{css}
+    </style>
+</head>
+<body>
+    {body}
+</body>
+</html>"""
+    
+    def __init__(self,
+                 markdown_extras: Optional[list] = None,
+                 font_config: Optional[FontConfiguration] = None,
+                 engine: str = 'markdown2'):
         """Initialize the converter.
         
         Args:
             markdown_extras: List of markdown2 extras to enable
+            font_config: WeasyPrint font configuration to use. Pass the same
+                instance to several converters to load the theme fonts once
+            engine: Markdown engine, see HTMLProcessor
+            
+        Raises:
+            InvalidMarkdownError: If the engine is unknown or cannot be used
         """
-        self.html_processor = HTMLProcessor(markdown_extras)
+        self.html_processor = HTMLProcessor(markdown_extras, engine)
         self.style_manager = StyleManager()
         self.theme_manager = ThemeManager(self.style_manager)
-        self.font_config = FontConfiguration()
+        self.font_config = font_config or FontConfiguration()
+        # Parsed stylesheets (with their @font-face rules already resolved
+        # against font_config) keyed by (theme, custom CSS, custom CSS file state),
+        # least recently used first
+        self._stylesheet_cache = OrderedDict()
     
     def convert_file(self, 
                     markdown_file_path: str, 
@@ -49,6 +93,124 @@ class MarkdownToPDFConverter:
         Returns:
             Path to the generated PDF file
             
+        Raises:
+            ConverterFileNotFoundError: If markdown file is not found
+            ConversionError: If conversion fails
+        """
+        # Determine output path
+        if output_pdf_path is None:
+            base_name = Path(markdown_file_path).stem
+            output_pdf_path = str(Path(markdown_file_path).parent / f"{base_name}.pdf")
+        
+        pdf_bytes = self.render_file(
+            markdown_file_path, theme, custom_css, custom_css_file, meta_tags
+        )
+        self._write_pdf(pdf_bytes, output_pdf_path)
+        
+        return output_pdf_path
+    
+    def convert_files(self,
+                      markdown_file_paths: List[str],
+                      output_pdf_path: str,
+                      theme: str = 'default',
+                      custom_css: Optional[str] = None,
+                      custom_css_file: Optional[str] = None,
+                      meta_tags: Optional[Dict[str, str]] = None) -> str:
+        """Convert several markdown files into a single PDF document.
+        
+        Each file starts on a new page. The whole document is laid out and
+        written in one WeasyPrint pass, so fonts, CSS and the PDF writer are
+        set up once for all inputs.
+        
+        Args:
+            markdown_file_paths: Paths to the markdown files, in document order
+            output_pdf_path: Path for the output PDF
+            theme: Theme name to use for styling
+            custom_css: Custom CSS content as string
+            custom_css_file: Path to custom CSS file
+            meta_tags: Additional meta tags for the HTML document
+            
+        Returns:
+            Path to the generated PDF file
+            
+        Raises:
+            ConverterFileNotFoundError: If a markdown file is not found
+            ConversionError: If conversion fails
+        """
+        if not markdown_file_paths:
+            raise ConversionError("No markdown files to convert")
+        
+        # Validate input files
+        for markdown_file_path in markdown_file_paths:
+            if not os.path.exists(markdown_file_path):
+                raise ConverterFileNotFoundError(markdown_file_path)
+        
+        try:
+            # Create one HTML document with a page break between the inputs
+            full_html = self._build_merged_html(markdown_file_paths, meta_tags)
+            
+            # Get (possibly cached) stylesheet
+            stylesheet = self._get_stylesheet(theme, custom_css, custom_css_file)
+            
+            # Convert to PDF
+            self._generate_pdf(full_html, stylesheet, output_pdf_path)
+            
+            return output_pdf_path
+            
+        except Exception as e:
+            if isinstance(e, (ConverterFileNotFoundError, ConversionError, StyleError)):
+                raise
+            raise ConversionError("Unexpected error during conversion", e)
+    
+    def _build_merged_html(self,
+                           markdown_file_paths: List[str],
+                           meta_tags: Optional[Dict[str, str]] = None) -> str:
+        """Build one HTML document from several markdown files.
+        
+        Args:
+            markdown_file_paths: Paths to the markdown files, in document order
+            meta_tags: Additional meta tags for the HTML document
+            
+        Returns:
+            Complete HTML document with each file in its own section
+        """
+        bodies = []
+        title = None
+        for index, markdown_file_path in enumerate(markdown_file_paths):
+            markdown_content = self.html_processor.read_markdown_file(markdown_file_path)
+            body = self.html_processor.convert_markdown_to_html(markdown_content)
+            
+            # Keep heading and footnote ids unique across the merged documents
+            if index:
+                body = _ID_REFERENCE_RE.sub(rf'\g<0>doc{index + 1}-', body)
+            bodies.append(self._MERGED_DOCUMENT_TEMPLATE.format(body=body))
+            
+            # The first document names the merged PDF
+            if title is None:
+                title = self.html_processor.extract_title_from_markdown(markdown_content)
+        
+        return self.html_processor.create_complete_html_document(
+            '\n'.join(bodies), title, meta_tags
+        )
+    
+    def render_file(self,
+                    markdown_file_path: str,
+                    theme: str = 'default',
+                    custom_css: Optional[str] = None,
+                    custom_css_file: Optional[str] = None,
+                    meta_tags: Optional[Dict[str, str]] = None) -> bytes:
+        """Render a markdown file to PDF bytes without writing them to disk.
+        
+        Args:
+            markdown_file_path: Path to the markdown file
+            theme: Theme name to use for styling
+            custom_css: Custom CSS content as string
+            custom_css_file: Path to custom CSS file
+            meta_tags: Additional meta tags for the HTML document
+            
+        Returns:
+            Rendered PDF document
+            
         Raises:
             ConverterFileNotFoundError: If markdown file is not found
             ConversionError: If conversion fails
@@ -58,12 +220,13 @@ class MarkdownToPDFConverter:
             raise ConverterFileNotFoundError(markdown_file_path)
         
         try:
+            # Read the markdown once and reuse it for both the body and the title
+            markdown_content = self.html_processor.read_markdown_file(markdown_file_path)
+            
             # Process markdown to HTML
-            html_content = self.html_processor.process_markdown_file(markdown_file_path)
+            html_content = self.html_processor.convert_markdown_to_html(markdown_content)
             
             # Extract title from markdown for the document
-            with open(markdown_file_path, 'r', encoding='utf-8') as file:
-                markdown_content = file.read()
             title = self.html_processor.extract_title_from_markdown(markdown_content)
             
             # Create complete HTML document
@@ -71,18 +234,11 @@ class MarkdownToPDFConverter:
                 html_content, title, meta_tags
             )
             
-            # Determine output path
-            if output_pdf_path is None:
-                base_name = Path(markdown_file_path).stem
-                output_pdf_path = str(Path(markdown_file_path).parent / f"{base_name}.pdf")
-            
-            # Generate CSS
-            css_content = self._prepare_css(theme, custom_css, custom_css_file)
-            
-            # Convert to PDF
-            self._generate_pdf(full_html, css_content, output_pdf_path)
+            # Get (possibly cached) stylesheet
+            stylesheet = self._get_stylesheet(theme, custom_css, custom_css_file)
             
-            return output_pdf_path
+            # Render to PDF
+            return self._render_pdf(full_html, stylesheet)
             
         except Exception as e:
             if isinstance(e, (ConverterFileNotFoundError, ConversionError, StyleError)):
@@ -123,11 +279,11 @@ class MarkdownToPDFConverter:
                 html_content, title, meta_tags
             )
             
-            # Generate CSS
-            css_content = self._prepare_css(theme, custom_css, custom_css_file)
+            # Get (possibly cached) stylesheet
+            stylesheet = self._get_stylesheet(theme, custom_css, custom_css_file)
             
             # Convert to PDF
-            self._generate_pdf(full_html, css_content, output_pdf_path)
+            self._generate_pdf(full_html, stylesheet, output_pdf_path)
             
             return output_pdf_path
             
@@ -173,30 +329,116 @@ class MarkdownToPDFConverter:
                 raise
             raise StyleError(f"Error preparing CSS: {e}")
     
-    def _generate_pdf(self, html_content: str, css_content: str, output_path: str) -> None:
-        """Generate PDF from HTML and CSS content.
+    def _get_stylesheet(self,
+                        theme: str,
+                        custom_css: Optional[str] = None,
+                        custom_css_file: Optional[str] = None) -> CSS:
+        """Get the parsed stylesheet for a theme and custom CSS combination.
+        
+        Stylesheets are built once and reused for later conversions with the
+        same arguments, so batch runs only assemble and parse the CSS once.
+        
+        Args:
+            theme: Theme name
+            custom_css: Custom CSS content
+            custom_css_file: Path to custom CSS file
+            
+        Returns:
+            WeasyPrint CSS object
+            
+        Raises:
+            StyleError: If CSS preparation fails
+        """
+        key = (theme, custom_css, custom_css_file, self._css_file_state(custom_css_file))
+        stylesheet = self._stylesheet_cache.get(key)
+        if stylesheet is None:
+            css_content = self._prepare_css(theme, custom_css, custom_css_file)
+            try:
+                stylesheet = CSS(string=css_content, font_config=self.font_config)
+            except Exception as e:
+                raise StyleError(f"Error parsing CSS: {e}")
+            self._stylesheet_cache[key] = stylesheet
+            if len(self._stylesheet_cache) > _STYLESHEET_CACHE_SIZE:
+                self._stylesheet_cache.popitem(last=False)
+        else:
+            self._stylesheet_cache.move_to_end(key)
+        return stylesheet
+    
+    @staticmethod
+    def _css_file_state(css_file_path: Optional[str]) -> Optional[int]:
+        """Get the modification time of a custom CSS file for cache keys.
+        
+        Args:
+            css_file_path: Path to the CSS file
+            
+        Returns:
+            Modification time in nanoseconds, or None if there is no readable file
+        """
+        if not css_file_path:
+            return None
+        try:
+            return os.stat(css_file_path).st_mtime_ns
+        except OSError:
+            # Let _prepare_css report the missing file
+            return None
+    
+    def _generate_pdf(self, html_content: str, stylesheet: CSS, output_path: str) -> None:
+        """Generate PDF from HTML content and a parsed stylesheet.
         
         Args:
             html_content: Complete HTML document
-            css_content: CSS styling
+            stylesheet: Parsed CSS styling
             output_path: Output PDF file path
             
         Raises:
             ConversionError: If PDF generation fails
         """
+        self._write_pdf(self._render_pdf(html_content, stylesheet), output_path)
+    
+    def _render_pdf(self, html_content: str, stylesheet: CSS) -> bytes:
+        """Lay out HTML content and serialize it to PDF bytes.
+        
+        Args:
+            html_content: Complete HTML document
+            stylesheet: Parsed CSS styling
+            
+        Returns:
+            Rendered PDF document
+            
+        Raises:
+            ConversionError: If PDF rendering fails
+        """
         try:
-            # Create HTML and CSS objects
             html_doc = HTML(string=html_content)
-            css_doc = CSS(string=css_content, font_config=self.font_config)
+            return html_doc.write_pdf(stylesheets=[stylesheet], font_config=self.font_config)
+        except Exception as e:
+            raise ConversionError(f"Failed to generate PDF: {e}", e)
+    
+    @staticmethod
+    def _write_pdf(pdf_bytes: bytes, output_path: str) -> None:
+        """Write rendered PDF bytes to disk.
+        
+        Args:
+            pdf_bytes: Rendered PDF document
+            output_path: Output PDF file path
             
+        Raises:
+            ConversionError: If the file cannot be written
+        """
+        # Write next to the target and swap it in, so a concurrent writer of
+        # the same path (e.g. two batch workers) can never interleave bytes
+        temp_path = f"{output_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
             # Ensure output directory exists
-            output_dir = Path(output_path).parent
-            output_dir.mkdir(parents=True, exist_ok=True)
+            ensure_directory_exists(os.path.dirname(os.path.abspath(output_path)))
             
-            html_doc.write_pdf(output_path, stylesheets=[css_doc], font_config=self.font_config)
+            Path(temp_path).write_bytes(pdf_bytes)
+            os.replace(temp_path, output_path)
             
         except Exception as e:
-            raise ConversionError(f"Failed to generate PDF: {e}", e)
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise ConversionError(f"Failed to write PDF: {e}", e)
     
     def get_available_themes(self) -> Dict[str, str]:
         """Get available themes.
@@ -242,22 +484,7 @@ class MarkdownToPDFConverter:
             # Create HTML with inline CSS
             title = self.html_processor.extract_title_from_markdown(markdown_content)
             
-            return f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{title}</title>
-    <style>
-{css_content}
-    </style>
-</head>
-<body>
-    {html_content}
-</body>
-</html>
-            """.strip()
+            return self._PREVIEW_TEMPLATE.format(title=html.escape(title), css=css_content, body=html_content)
             
         except Exception as e:
             raise ConversionError(f"Failed to generate HTML preview: {e}", e)
\ No newline at end of file
@@ -1,20 +1,142 @@
 """HTML processing and generation from markdown content."""
 
+import hashlib
+import html
+import os
+import re
 import markdown2
-from typing import Dict, Any, Optional
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Any, Iterable, List, Optional
 from .exceptions import InvalidMarkdownError
+from .utils import find_frontmatter
+
+try:
+    import cmarkgfm
+    from cmarkgfm.cmark import Options as CmarkOptions
+except ImportError:  # Optional: without it every document goes through markdown2
+    cmarkgfm = None
+
+# First heading line (any level) with text; leading '#' markers and surrounding whitespace are excluded
+_HEADING_RE = re.compile(r'^[^\S\n]*#+(?!#)[^\S\n]*(\S.*?)[^\S\n]*$', re.M)
+
+# Number of converted documents each processor keeps
+_HTML_CACHE_SIZE = 32
+
+# markdown2 extras that cmark-gfm reproduces, mapped to (extension, option flag name)
+_CMARK_EXTRAS = {
+    'fenced-code-blocks': (None, None),
+    'cuddled-lists': (None, None),
+    'metadata': (None, None),
+    'tables': ('table', None),
+    'strike': ('strikethrough', None),
+    'task_list': ('tasklist', None),
+    'footnotes': (None, 'CMARK_OPT_FOOTNOTES'),
+    'smarty-pants': (None, 'CMARK_OPT_SMART')
+}
 
 
 class HTMLProcessor:
-    """Processes markdown content and converts it to HTML."""
+    """Processes markdown content and converts it to HTML.
+    
+    Instances keep reusable markdown2 converters and are not thread-safe;
+    use one processor per thread.
+    """
+    
+    # Document skeleton shared by every conversion; only the placeholders vary
+    _DOCUMENT_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{title}</title>
+    {meta}
+</head>
+<body>
+    {body}
+</body>
+</html>"""
     
-    def __init__(self, markdown_extras: Optional[list] = None):
+    ENGINES = ('auto', 'markdown2', 'cmark')
+    
+    def __init__(self, markdown_extras: Optional[list] = None, engine: str = 'markdown2'):
         """Initialize the HTML processor.
         
         Args:
             markdown_extras: List of markdown2 extras to enable
+            engine: Markdown engine: 'markdown2' (the default), 'cmark' (requires
+                cmarkgfm; without markdown_extras it enables the default extras
+                cmark supports) or 'auto' to use cmark whenever it is installed
+                and supports all enabled extras. Output can differ between
+                engines, so cmark is only used when asked for
+                
+        Raises:
+            InvalidMarkdownError: If the engine is unknown or cannot be used
+        """
+        if engine not in self.ENGINES:
+            raise InvalidMarkdownError(f"Unknown markdown engine '{engine}'. Available engines: {list(self.ENGINES)}")
+        self._engine = engine
+        if markdown_extras is None and engine == 'cmark':
+            # Default to the extras cmark can reproduce rather than failing on the rest
+            markdown_extras = [extra for extra in self._get_default_extras() if extra in _CMARK_EXTRAS]
+        self._set_extras(markdown_extras or self._get_default_extras())
+    
+    def _set_extras(self, extras: list) -> None:
+        """Store the enabled extras and build the markdown converters for them."""
+        cmark_settings = self._get_cmark_settings(extras)
+        self.markdown_extras = extras
+        self._has_metadata_extra = 'metadata' in extras
+        self._extras_key = tuple(sorted(extras))
+        self._extras_key_no_metadata = tuple(extra for extra in self._extras_key if extra != 'metadata')
+        
+        # Reuse converter objects across documents; convert() resets their state
+        self._markdown = markdown2.Markdown(extras=list(self._extras_key))
+        self._markdown_no_metadata = markdown2.Markdown(extras=list(self._extras_key_no_metadata))
+        self._cmark_settings = cmark_settings
+        # Converted HTML keyed by (content digest, use_metadata), least recently used first
+        self._html_cache = OrderedDict()
+    
+    def _get_cmark_settings(self, extras: list) -> Optional[tuple]:
+        """Get the cmark-gfm (extensions, options) for the extras, or None to use markdown2.
+        
+        Raises:
+            InvalidMarkdownError: If the cmark engine was requested but cannot be used
         """
-        self.markdown_extras = markdown_extras or self._get_default_extras()
+        if self._engine == 'markdown2':
+            return None
+        
+        unsupported = [extra for extra in extras if extra not in _CMARK_EXTRAS]
+        if cmarkgfm is None or unsupported:
+            if self._engine == 'cmark':
+                reason = "cmarkgfm is not installed" if cmarkgfm is None else f"unsupported extras: {unsupported}"
+                raise InvalidMarkdownError(f"Cannot use the cmark engine: {reason}")
+            return None
+        
+        # Raw HTML is passed through, as markdown2 does
+        extensions = []
+        options = CmarkOptions.CMARK_OPT_UNSAFE
+        for extra in extras:
+            extension, option = _CMARK_EXTRAS[extra]
+            if extension:
+                extensions.append(extension)
+            if option:
+                options |= getattr(CmarkOptions, option)
+        return extensions, options
+    
+    def _convert(self, markdown_content: str, use_metadata: bool) -> str:
+        """Convert markdown to HTML with or without the metadata extra."""
+        if self._cmark_settings is not None:
+            if use_metadata and self._has_metadata_extra:
+                # Drop the frontmatter block, as markdown2's metadata extra does
+                match = find_frontmatter(markdown_content, allow_leading_whitespace=True)
+                if match:
+                    markdown_content = markdown_content[match.end():]
+            extensions, options = self._cmark_settings
+            return cmarkgfm.markdown_to_html_with_extensions(markdown_content, options=options, extensions=extensions)
+        
+        markdown = self._markdown if use_metadata else self._markdown_no_metadata
+        return markdown.convert(markdown_content)
     
     def convert_markdown_to_html(self, markdown_content: str) -> str:
         """Convert markdown content to HTML.
@@ -30,25 +152,21 @@ class HTMLProcessor:
         """
         try:
             # Check if metadata extra is enabled but no metadata section exists
-            if 'metadata' in self.markdown_extras and not self._has_metadata_section(markdown_content):
-                # Temporarily disable metadata extra to avoid heading stripping
-                original_extras = self.markdown_extras.copy()
-                filtered_extras = [extra for extra in self.markdown_extras if extra != 'metadata']
-                
-                html_content = markdown2.markdown(
-                    markdown_content,
-                    extras=filtered_extras
-                )
-                
-                # Restore original extras
-                self.markdown_extras = original_extras
-                return html_content
+            # Disable metadata extra for such documents to avoid heading stripping
+            use_metadata = not self._has_metadata_extra or self._has_metadata_section(markdown_content)
+            
+            # Key on a digest so the cache does not keep whole documents alive
+            digest = hashlib.blake2b(markdown_content.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+            key = (digest, use_metadata)
+            html_content = self._html_cache.get(key)
+            if html_content is None:
+                html_content = self._convert(markdown_content, use_metadata)
+                self._html_cache[key] = html_content
+                if len(self._html_cache) > _HTML_CACHE_SIZE:
+                    self._html_cache.popitem(last=False)
             else:
-                html_content = markdown2.markdown(
-                    markdown_content,
-                    extras=self.markdown_extras
-                )
-                return html_content
+                self._html_cache.move_to_end(key)
+            return html_content
         except Exception as e:
             raise InvalidMarkdownError(f"Failed to convert markdown to HTML: {e}")
     
@@ -64,45 +182,73 @@ class HTMLProcessor:
         Returns:
             Complete HTML document
         """
-        meta_html = self._generate_meta_tags(meta_tags or {})
+        meta_html = self._generate_meta_tags(meta_tags)
         
-        return f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{title}</title>
-    {meta_html}
-</head>
-<body>
-    {body_content}
-</body>
-</html>
-        """.strip()
+        return self._DOCUMENT_TEMPLATE.format(title=html.escape(title), meta=meta_html, body=body_content)
     
-    def process_markdown_file(self, file_path: str) -> str:
-        """Process a markdown file and return HTML content.
+    def read_markdown_file(self, file_path: str) -> str:
+        """Read the raw content of a markdown file.
         
         Args:
             file_path: Path to the markdown file
             
         Returns:
-            HTML content
+            Raw markdown content
             
         Raises:
-            InvalidMarkdownError: If file cannot be read or processed
+            InvalidMarkdownError: If file cannot be read
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                markdown_content = file.read()
-            return self.convert_markdown_to_html(markdown_content)
+            return Path(file_path).read_text(encoding='utf-8')
         except FileNotFoundError:
             raise InvalidMarkdownError(f"Markdown file not found: {file_path}")
         except UnicodeDecodeError as e:
             raise InvalidMarkdownError(f"Error reading file {file_path}: {e}")
         except Exception as e:
-            raise InvalidMarkdownError(f"Error processing markdown file {file_path}: {e}")
+            raise InvalidMarkdownError(f"Error reading markdown file {file_path}: {e}")
+    
+    def process_markdown_file(self, file_path: str) -> str:
+        """Process a markdown file and return HTML content.
+        
+        Args:
+            file_path: Path to the markdown file
+            
+        Returns:
+            HTML content
+            
+        Raises:
+            InvalidMarkdownError: If file cannot be read or processed
+        """
+        return self.convert_markdown_to_html(self.read_markdown_file(file_path))
+    
+    def process_markdown_files(self, file_paths: Iterable[str], max_workers: Optional[int] = None) -> List[str]:
+        """Process many markdown files in parallel worker processes.
+        
+        markdown2 holds the GIL for its regex work, so files are spread over
+        processes; each worker builds its own processor with the same extras
+        and engine.
+        
+        Args:
+            file_paths: Paths to the markdown files
+            max_workers: Maximum number of worker processes (defaults to CPU count)
+            
+        Returns:
+            HTML content for each file, in input order
+            
+        Raises:
+            InvalidMarkdownError: If any file cannot be read or processed
+        """
+        file_paths = list(file_paths)
+        workers = min(len(file_paths), max_workers or os.cpu_count() or 1)
+        if workers <= 1:
+            return [self.process_markdown_file(file_path) for file_path in file_paths]
+        
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker_processor,
+            initargs=(self.markdown_extras, self._engine)
+        ) as executor:
+            return list(executor.map(_process_in_worker, file_paths))
     
     def extract_title_from_markdown(self, markdown_content: str) -> str:
         """Extract title from markdown content (first heading of any level).
@@ -113,15 +259,10 @@ class HTMLProcessor:
         Returns:
             Extracted title or default title
         """
-        lines = markdown_content.split('\n')
-        for line in lines:
-            line = line.strip()
-            # Check for any heading level (H1-H6)
-            if line.startswith('#'):
-                # Remove the heading markers and return the text
-                title = line.lstrip('#').strip()
-                if title:  # Only return if there's actual text
-                    return title
+        # Search the text in one regex pass instead of splitting it into lines
+        match = _HEADING_RE.search(markdown_content)
+        if match:
+            return match.group(1)
         return "Markdown Document"
     
     def _get_default_extras(self) -> list:
@@ -143,16 +284,18 @@ class HTMLProcessor:
     def _has_metadata_section(self, markdown_content: str) -> bool:
         """Check if markdown content contains a metadata section.
         
+        The content is matched in place: documents without an opening
+        '---' fence are rejected at their first non-whitespace character.
+        
         Args:
             markdown_content: Raw markdown content
             
         Returns:
             True if metadata section exists, False otherwise
         """
-        content = markdown_content.strip()
-        return content.startswith('---\n') or content.startswith('---\r\n')
+        return find_frontmatter(markdown_content, allow_leading_whitespace=True) is not None
 
-    def _generate_meta_tags(self, meta_tags: Dict[str, str]) -> str:
+    def _generate_meta_tags(self, meta_tags: Optional[Dict[str, str]]) -> str:
         """Generate HTML meta tags.
         
         Args:
@@ -161,10 +304,12 @@ class HTMLProcessor:
         Returns:
             HTML meta tags string
         """
-        meta_html = []
-        for name, content in meta_tags.items():
-            meta_html.append(f'    <meta name="{name}" content="{content}">')
-        return '\n'.join(meta_html)
+        if not meta_tags:
+            return ''
+        return '\n'.join([
+            f'    <meta name="{html.escape(name)}" content="{html.escape(content)}">'
+            for name, content in meta_tags.items()
+        ])
     
     def get_available_extras(self) -> Dict[str, str]:
         """Get information about available markdown extras.
@@ -201,4 +346,19 @@ class HTMLProcessor:
                 f"Available extras: {available_extras}"
             )
         
-        self.markdown_extras = extras
\ No newline at end of file
+        self._set_extras(extras)
+
+
+# Processor owned by the current worker process of process_markdown_files
+_worker_processor = None
+
+
+def _init_worker_processor(markdown_extras: list, engine: str) -> None:
+    """Build the processor used by this worker process."""
+    global _worker_processor
+    _worker_processor = HTMLProcessor(markdown_extras, engine)
+
+
+def _process_in_worker(file_path: str) -> str:
+    """Process a single markdown file inside a worker process."""
+    return _worker_processor.process_markdown_file(file_path)
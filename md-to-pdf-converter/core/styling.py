@@ -1,58 +1,38 @@
 """CSS styling management for PDF generation."""
 
+import os
+import re
+from functools import lru_cache
 from typing import Optional
 from pathlib import Path
 from .exceptions import StyleError
 
 
-class StyleManager:
-    """Manages CSS styling for PDF generation."""
-    
-    def __init__(self):
-        self._default_css = self._load_default_css()
-    
-    def get_default_css(self) -> str:
-        """Get the default CSS styling."""
-        return self._default_css
-    
-    def load_custom_css(self, css_file_path: str) -> str:
-        """Load custom CSS from a file.
-        
-        Args:
-            css_file_path: Path to the CSS file
-            
-        Returns:
-            CSS content as string
-            
-        Raises:
-            StyleError: If CSS file cannot be read
-        """
-        try:
-            with open(css_file_path, 'r', encoding='utf-8') as file:
-                return file.read()
-        except FileNotFoundError:
-            raise StyleError(f"CSS file not found: {css_file_path}")
-        except Exception as e:
-            raise StyleError(f"Error reading CSS file: {e}")
-    
-    def merge_css(self, base_css: str, custom_css: str) -> str:
-        """Merge base CSS with custom CSS.
-        
-        Args:
-            base_css: Base CSS content
-            custom_css: Custom CSS to override/extend base
-            
-        Returns:
-            Merged CSS content
-        """
-        return f"{base_css}\n\n/* Custom Styles */\n{custom_css}"
+# Manrope fonts bundled with the package
+_FONT_DIR = (Path(__file__).resolve().parent.parent / 'fonts' / 'Manrope').as_posix()
+
+# Comments and insignificant whitespace removed from the built-in stylesheets
+_CSS_COMMENT_RE = re.compile(r'/\*.*?\*/', re.S)
+_CSS_WHITESPACE_RE = re.compile(r'\s+')
+_CSS_PUNCTUATION_RE = re.compile(r' ?([{};,>]) ?')
+_CSS_COLON_RE = re.compile(r': ')
+
+
+def _minify_css(css: str) -> str:
+    """Minify CSS so WeasyPrint has less text to tokenize.
     
-    def _load_default_css(self) -> str:
-        """Load the default CSS styling."""
-        font_dir = Path(__file__).resolve().parent.parent / 'fonts' / 'Manrope'
-        font_dir_posix = font_dir.as_posix()
-        return (
-            """
+    Quoted strings are not protected, so this is only meant for the
+    stylesheets defined in this module.
+    """
+    css = _CSS_COMMENT_RE.sub('', css)
+    css = _CSS_WHITESPACE_RE.sub(' ', css)
+    css = _CSS_PUNCTUATION_RE.sub(r'\1', css)
+    return _CSS_COLON_RE.sub(':', css).strip()
+
+
+# Default stylesheet, built once at import (minified before the font path is inserted)
+_DEFAULT_CSS = _minify_css(
+    """
         @font-face {
             font-family: 'Manrope';
             src: local('Manrope ExtraLight'), url('file:///{FONT_DIR}/Manrope-ExtraLight.ttf') format('truetype');
@@ -145,6 +125,15 @@ class StyleManager:
             page-break-before: avoid;
         }
         
+        /* Documents merged into one PDF: one page break per document */
+        section.merged-document + section.merged-document {
+            page-break-before: always;
+        }
+        
+        section.merged-document > h1:first-child {
+            page-break-before: avoid;
+        }
+        
         h2 {
             font-size: 1.8em;
             border-bottom: 2px solid #3498db;
@@ -328,54 +317,9 @@ class StyleManager:
             }
         }
         """
-        ).replace("{FONT_DIR}", font_dir_posix)
+).replace("{FONT_DIR}", _FONT_DIR)
 
-
-class ThemeManager:
-    """Manages predefined themes for PDF styling."""
-    
-    THEMES = {
-        'default': 'Default professional theme',
-        'minimal': 'Clean minimal theme',
-        'academic': 'Academic paper theme',
-        'modern': 'Modern colorful theme'
-    }
-    
-    def __init__(self, style_manager: StyleManager):
-        self.style_manager = style_manager
-    
-    def get_theme_css(self, theme_name: str) -> str:
-        """Get CSS for a specific theme.
-        
-        Args:
-            theme_name: Name of the theme
-            
-        Returns:
-            CSS content for the theme
-            
-        Raises:
-            StyleError: If theme is not found
-        """
-        if theme_name not in self.THEMES:
-            raise StyleError(f"Theme '{theme_name}' not found. Available themes: {list(self.THEMES.keys())}")
-        
-        if theme_name == 'default':
-            return self.style_manager.get_default_css()
-        elif theme_name == 'minimal':
-            return self._get_minimal_theme()
-        elif theme_name == 'academic':
-            return self._get_academic_theme()
-        elif theme_name == 'modern':
-            return self._get_modern_theme()
-    
-    def list_themes(self) -> dict:
-        """List all available themes."""
-        return self.THEMES.copy()
-    
-    def _get_minimal_theme(self) -> str:
-        """Get minimal theme CSS."""
-        base_css = self.style_manager.get_default_css()
-        minimal_overrides = """
+_MINIMAL_OVERRIDES = _minify_css("""
         h1, h2, h3, h4, h5, h6 {
             color: #000;
             border-bottom: none;
@@ -399,13 +343,9 @@ class ThemeManager:
             border-left: none;
             background-color: #f5f5f5;
         }
-        """
-        return self.style_manager.merge_css(base_css, minimal_overrides)
-    
-    def _get_academic_theme(self) -> str:
-        """Get academic theme CSS."""
-        base_css = self.style_manager.get_default_css()
-        academic_overrides = """
+        """)
+
+_ACADEMIC_OVERRIDES = _minify_css("""
         body {
             font-family: 'Manrope', 'Segoe UI', 'Helvetica Neue', Arial, sans-serif;
             font-size: 12pt;
@@ -437,13 +377,9 @@ class ThemeManager:
             margin-left: 2em;
             margin-right: 2em;
         }
-        """
-        return self.style_manager.merge_css(base_css, academic_overrides)
-    
-    def _get_modern_theme(self) -> str:
-        """Get modern theme CSS."""
-        base_css = self.style_manager.get_default_css()
-        modern_overrides = """
+        """)
+
+_MODERN_OVERRIDES = _minify_css("""
         body {
             font-family: 'Manrope', 'Segoe UI', 'Helvetica Neue', Arial, sans-serif;
         }
@@ -479,5 +415,116 @@ class ThemeManager:
             background-color: #667eea;
             color: white;
         }
+        """)
+
+# Complete theme stylesheets (default CSS followed by the theme overrides)
+_MINIMAL_CSS = f"{_DEFAULT_CSS}\n\n/* Custom Styles */\n{_MINIMAL_OVERRIDES}"
+_ACADEMIC_CSS = f"{_DEFAULT_CSS}\n\n/* Custom Styles */\n{_ACADEMIC_OVERRIDES}"
+_MODERN_CSS = f"{_DEFAULT_CSS}\n\n/* Custom Styles */\n{_MODERN_OVERRIDES}"
+
+
+@lru_cache(maxsize=32)
+def _read_css_file(css_file_path: str, mtime_ns: int, size: int) -> str:
+    """Read a CSS file; the stat fields are part of the cache key only."""
+    return Path(css_file_path).read_text(encoding='utf-8')
+
+
+class StyleManager:
+    """Manages CSS styling for PDF generation."""
+    
+    def __init__(self):
+        self._default_css = _DEFAULT_CSS
+    
+    def get_default_css(self) -> str:
+        """Get the default CSS styling."""
+        return self._default_css
+    
+    def load_custom_css(self, css_file_path: str) -> str:
+        """Load custom CSS from a file.
+        
+        File contents are cached and reused until the file's modification
+        time or size changes.
+        
+        Args:
+            css_file_path: Path to the CSS file
+            
+        Returns:
+            CSS content as string
+            
+        Raises:
+            StyleError: If CSS file cannot be read
+        """
+        try:
+            stat = os.stat(css_file_path)
+            return _read_css_file(css_file_path, stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            raise StyleError(f"CSS file not found: {css_file_path}")
+        except Exception as e:
+            raise StyleError(f"Error reading CSS file: {e}")
+    
+    def merge_css(self, base_css: str, custom_css: str) -> str:
+        """Merge base CSS with custom CSS.
+        
+        Args:
+            base_css: Base CSS content
+            custom_css: Custom CSS to override/extend base
+            
+        Returns:
+            Merged CSS content
+        """
+        return f"{base_css}\n\n/* Custom Styles */\n{custom_css}"
+
+
+class ThemeManager:
+    """Manages predefined themes for PDF styling."""
+    
+    THEMES = {
+        'default': 'Default professional theme',
+        'minimal': 'Clean minimal theme',
+        'academic': 'Academic paper theme',
+        'modern': 'Modern colorful theme'
+    }
+    
+    def __init__(self, style_manager: StyleManager):
+        self.style_manager = style_manager
+        self._theme_getters = {
+            'default': style_manager.get_default_css,
+            'minimal': self._get_minimal_theme,
+            'academic': self._get_academic_theme,
+            'modern': self._get_modern_theme
+        }
+    
+    def get_theme_css(self, theme_name: str) -> str:
+        """Get CSS for a specific theme.
+        
+        Args:
+            theme_name: Name of the theme
+            
+        Returns:
+            CSS content for the theme
+            
+        Raises:
+            StyleError: If theme is not found
         """
-        return self.style_manager.merge_css(base_css, modern_overrides)
+        try:
+            getter = self._theme_getters[theme_name]
+        except KeyError:
+            raise StyleError(f"Theme '{theme_name}' not found. Available themes: {list(self.THEMES.keys())}")
+        
+        return getter()
+    
+    def list_themes(self) -> dict:
+        """List all available themes."""
+        return self.THEMES.copy()
+    
+    def _get_minimal_theme(self) -> str:
+        """Get minimal theme CSS."""
+        return _MINIMAL_CSS
+    
+    def _get_academic_theme(self) -> str:
+        """Get academic theme CSS."""
+        return _ACADEMIC_CSS
+    
+    def _get_modern_theme(self) -> str:
+        """Get modern theme CSS."""
+        return _MODERN_CSS
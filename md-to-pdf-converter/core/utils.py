@@ -1,18 +1,49 @@
 """Utility functions for the markdown to PDF converter."""
 
 import os
+import re
 import sys
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterable, Iterator, Match
+
+# File suffixes treated as markdown
+_MD_SUFFIXES = frozenset({'.md', '.markdown'})
+_MD_ENDINGS = tuple(_MD_SUFFIXES)
+
+# YAML frontmatter block delimited by '---' lines, opening on the first line
+_FRONTMATTER_RE = re.compile(r'\A[ \t\r]*---[ \t\r]*\n(.*?)^[ \t\r]*---[ \t\r]*$', re.S | re.M)
+
+# The same block, allowing blank lines before the opening fence
+_PADDED_FRONTMATTER_RE = re.compile(r'\A\s*---[ \t]*\r?\n(.*?)^[ \t]*---[ \t\r]*$', re.S | re.M)
+
+# 'key: value' line inside the frontmatter block
+_METADATA_LINE_RE = re.compile(r'^([^:\n]*):(.*)$', re.M)
+
+# Directories already created or verified by ensure_directory_exists in this process
+_ENSURED_DIRS = set()
+
+# Units used by get_file_size_formatted, largest last
+_SIZE_UNITS = ('bytes', 'KB', 'MB', 'GB')
+
+# Replace characters that are invalid in filenames with underscores
+_SANITIZE_TABLE = str.maketrans({char: '_' for char in '<>:"\\/|?*'})
 
 
 def ensure_directory_exists(directory_path: str) -> None:
     """Ensure a directory exists, creating it if necessary.
     
+    Directories are remembered per process, so repeated calls for the
+    same directory do not touch the filesystem again.
+    
     Args:
         directory_path: Path to the directory
     """
+    directory_path = os.fspath(directory_path)
+    if directory_path in _ENSURED_DIRS:
+        return
     Path(directory_path).mkdir(parents=True, exist_ok=True)
+    _ENSURED_DIRS.add(directory_path)
 
 
 def get_file_size_formatted(file_path: str) -> str:
@@ -24,15 +55,14 @@ def get_file_size_formatted(file_path: str) -> str:
     Returns:
         Formatted file size string
     """
-    size_bytes = os.path.getsize(file_path)
+    size_bytes = os.stat(file_path).st_size
     
-    # Format size
-    for unit in ['bytes', 'KB', 'MB', 'GB']:
-        if size_bytes < 1024.0 or unit == 'GB':
-            break
-        size_bytes /= 1024.0
+    # Pick the unit from the bit length: every unit is 2**10 times the previous one
+    unit_index = 0
+    if size_bytes >= 1024:
+        unit_index = min((size_bytes.bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
     
-    return f"{size_bytes:.2f} {unit}"
+    return f"{size_bytes / (1 << (10 * unit_index)):.2f} {_SIZE_UNITS[unit_index]}"
 
 
 def get_file_extension(file_path: str) -> str:
@@ -56,8 +86,7 @@ def is_markdown_file(file_path: str) -> bool:
     Returns:
         True if file is a markdown file, False otherwise
     """
-    extension = get_file_extension(file_path).lower()
-    return extension in ['md', 'markdown']
+    return os.path.splitext(file_path)[1].lower() in _MD_SUFFIXES
 
 
 def find_markdown_files(directory: str, recursive: bool = False) -> List[Path]:
@@ -70,14 +99,75 @@ def find_markdown_files(directory: str, recursive: bool = False) -> List[Path]:
     Returns:
         List of Path objects for markdown files
     """
-    directory_path = Path(directory)
+    return [Path(path) for path in iter_markdown_files(directory, recursive)]
+
+
+def iter_markdown_files(directory: str, recursive: bool = False) -> Iterator[str]:
+    """Yield the paths of markdown files in a directory.
     
+    The directory tree is traversed once, checking each file name against
+    all markdown suffixes, and paths are yielded as plain strings.
+    
+    Args:
+        directory: Directory to search
+        recursive: Whether to search recursively
+        
+    Yields:
+        Paths of markdown files
+    """
     if recursive:
-        md_files = list(directory_path.rglob('*.md')) + list(directory_path.rglob('*.markdown'))
+        for root, _, files in os.walk(directory):
+            for name in files:
+                if _is_markdown_name(name):
+                    yield os.path.join(root, name)
     else:
-        md_files = list(directory_path.glob('*.md')) + list(directory_path.glob('*.markdown'))
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if _is_markdown_name(entry.name) and entry.is_file():
+                    yield entry.path
+
+
+def _is_markdown_name(name: str) -> bool:
+    """Check a bare file name for a markdown suffix.
     
-    return md_files
+    Most names are rejected by a single C-level endswith; splitext only
+    runs for candidates so that names like '.md' are still excluded.
+    """
+    name = name.lower()
+    return name.endswith(_MD_ENDINGS) and os.path.splitext(name)[1] in _MD_SUFFIXES
+
+
+@lru_cache(maxsize=4096)
+def _real_directory(directory: str) -> str:
+    """Resolve symlinks in a directory path, memoized so sibling files share the work."""
+    return os.path.realpath(directory)
+
+
+def unique_paths(paths: Iterable, follow_symlinks: bool = False) -> List[Path]:
+    """Remove duplicate paths while preserving their first-seen order.
+    
+    By default paths are compared by their normalized absolute form, which is
+    computed from the path string alone (no filesystem access).
+    
+    Args:
+        paths: Iterable of path strings or Path objects
+        follow_symlinks: Also treat paths that resolve to the same real file
+            as duplicates
+        
+    Returns:
+        List of unique Path objects
+    """
+    unique = {}
+    for path in paths:
+        key = os.path.abspath(path)
+        if follow_symlinks:
+            if os.path.islink(key):
+                key = os.path.realpath(key)
+            else:
+                directory, name = os.path.split(key)
+                key = os.path.join(_real_directory(directory), name)
+        unique.setdefault(os.path.normcase(key), path)
+    return [Path(path) for path in unique.values()]
 
 
 def get_relative_path(file_path: str, base_path: str) -> str:
@@ -102,11 +192,22 @@ def sanitize_filename(filename: str) -> str:
     Returns:
         Sanitized filename
     """
-    # Replace invalid characters with underscore
-    invalid_chars = '<>:"\\/|?*'
-    for char in invalid_chars:
-        filename = filename.replace(char, '_')
-    return filename
+    return filename.translate(_SANITIZE_TABLE)
+
+
+def find_frontmatter(markdown_content: str, allow_leading_whitespace: bool = False) -> Optional[Match]:
+    """Find the YAML frontmatter block at the start of markdown content.
+    
+    Args:
+        markdown_content: Raw markdown content
+        allow_leading_whitespace: Also accept blank lines before the opening '---'
+        
+    Returns:
+        Match whose first group is the block between the fences and whose
+        end is the end of the closing fence, or None if there is no block
+    """
+    pattern = _PADDED_FRONTMATTER_RE if allow_leading_whitespace else _FRONTMATTER_RE
+    return pattern.match(markdown_content)
 
 
 def extract_metadata(markdown_content: str) -> Dict[str, Any]:
@@ -118,25 +219,16 @@ def extract_metadata(markdown_content: str) -> Dict[str, Any]:
     Returns:
         Dictionary of metadata
     """
-    metadata = {}
-    lines = markdown_content.split('\n')
+    match = find_frontmatter(markdown_content)
     
     # Check for YAML frontmatter
-    if lines and lines[0].strip() == '---':
-        frontmatter_end = -1
-        for i, line in enumerate(lines[1:], 1):
-            if line.strip() == '---':
-                frontmatter_end = i
-                break
-        
-        if frontmatter_end > 0:
-            frontmatter_lines = lines[1:frontmatter_end]
-            for line in frontmatter_lines:
-                if ':' in line:
-                    key, value = line.split(':', 1)
-                    metadata[key.strip()] = value.strip()
-    
-    return metadata
+    if not match:
+        return {}
+    
+    return {
+        key.strip(): value.strip()
+        for key, value in _METADATA_LINE_RE.findall(match.group(1))
+    }
 
 
 def get_default_output_path(input_path: str, output_extension: str = 'pdf') -> str:
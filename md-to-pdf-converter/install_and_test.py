@@ -1,11 +1,44 @@
 #!/usr/bin/env python3
 """Installation and testing script for the Markdown to PDF converter."""
 
+import importlib.util
 import os
 import sys
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
+# Files this script works with, resolved relative to the script itself
+SCRIPT_DIR = Path(__file__).resolve().parent
+REQUIREMENTS_FILE = SCRIPT_DIR / "requirements.txt"
+TEST_SCRIPT = SCRIPT_DIR / "test_converter.py"
+
+
+def ask_yes_no(question, assume_yes=False):
+    """Ask the user a yes/no question.
+    
+    When stdin is not a terminal (e.g. in CI) nobody can answer, so the
+    question is skipped and treated as answered "no" unless assume_yes is set.
+    
+    Args:
+        question: Question to show, without the "(y/n)" suffix
+        assume_yes: Answer "yes" without asking
+        
+    Returns:
+        True if the user answered yes
+    """
+    if assume_yes:
+        print(f"\n{question} yes (--yes)")
+        return True
+    
+    if not sys.stdin.isatty():
+        print(f"\n{question} no (stdin is not a terminal; pass --yes to answer yes)")
+        return False
+    
+    print(f"\n{question} (y/n): ", end="")
+    return input().lower().strip() in ['y', 'yes']
+
 
 def check_python_version():
     """Check if Python version is compatible."""
@@ -25,19 +58,18 @@ def install_dependencies():
     """Install required dependencies."""
     print("\nInstalling dependencies...")
     
-    requirements_file = Path(__file__).parent / "requirements.txt"
-    
-    if not requirements_file.exists():
-        print(f"❌ Requirements file not found: {requirements_file}")
+    if not REQUIREMENTS_FILE.exists():
+        print(f"❌ Requirements file not found: {REQUIREMENTS_FILE}")
         return False
     
     try:
-        # Install dependencies
-        result = subprocess.run(
-            [sys.executable, "-m", "pip", "install", "-r", str(requirements_file)],
-            capture_output=True,
-            text=True,
-            check=True
+        # Install dependencies; pip writes straight to our terminal so its
+        # progress shows up as it happens instead of being buffered
+        sys.stdout.flush()
+        subprocess.run(
+            [sys.executable, "-m", "pip", "install", "-r", str(REQUIREMENTS_FILE)],
+            check=True,
+            close_fds=False
         )
         
         print("✅ Dependencies installed successfully.")
@@ -46,16 +78,18 @@ def install_dependencies():
     except subprocess.CalledProcessError as e:
         print(f"❌ Failed to install dependencies:")
         print(f"   Error: {e}")
-        if e.stdout:
-            print(f"   Output: {e.stdout}")
-        if e.stderr:
-            print(f"   Error output: {e.stderr}")
         return False
     except Exception as e:
         print(f"❌ Unexpected error during installation: {e}")
         return False
 
 
+@lru_cache(maxsize=None)
+def is_package_available(package):
+    """Check whether a package can be found without importing (executing) it."""
+    return importlib.util.find_spec(package) is not None
+
+
 def check_dependencies():
     """Check if all required dependencies are available."""
     print("\nChecking dependencies...")
@@ -70,14 +104,14 @@ def check_dependencies():
     
     missing_packages = []
     
-    for package in required_packages:
-        try:
-            if package == "PIL":
-                import PIL
-            else:
-                __import__(package)
+    # Look the packages up concurrently; results come back in order
+    with ThreadPoolExecutor(max_workers=len(required_packages)) as executor:
+        availability = list(executor.map(is_package_available, required_packages))
+    
+    for package, available in zip(required_packages, availability):
+        if available:
             print(f"✅ {package} is available")
-        except ImportError:
+        else:
             print(f"❌ {package} is missing")
             missing_packages.append(package)
     
@@ -89,12 +123,24 @@ def check_dependencies():
     return True
 
 
-def test_weasyprint():
-    """Test WeasyPrint specifically as it can have platform-specific issues."""
+def test_weasyprint(full=False):
+    """Test WeasyPrint specifically as it can have platform-specific issues.
+    
+    Args:
+        full: Render a test PDF instead of only checking that WeasyPrint loads
+    """
     print("\nTesting WeasyPrint...")
     
     try:
-        from weasyprint import HTML, CSS
+        # Importing WeasyPrint already loads the native Pango/Cairo libraries
+        from weasyprint import HTML
+        
+        if not full:
+            if callable(getattr(HTML, 'write_pdf', None)):
+                print("✅ WeasyPrint loaded correctly.")
+                return True
+            print("❌ WeasyPrint does not provide HTML.write_pdf.")
+            return False
         
         # Create a simple test HTML
         test_html = """
@@ -134,36 +180,34 @@ def run_converter_tests():
     """Run the converter test suite."""
     print("\nRunning converter tests...")
     
-    test_script = Path(__file__).parent / "test_converter.py"
-    
-    if not test_script.exists():
-        print(f"❌ Test script not found: {test_script}")
+    if not TEST_SCRIPT.exists():
+        print(f"❌ Test script not found: {TEST_SCRIPT}")
         return False
     
+    # Run the suite in this interpreter instead of paying for a second
+    # interpreter start-up and re-importing WeasyPrint
+    original_cwd = os.getcwd()
     try:
-        result = subprocess.run(
-            [sys.executable, str(test_script)],
-            cwd=str(Path(__file__).parent),
-            input="n\n",  # Don't clean up files automatically
-            text=True,
-            capture_output=True
-        )
+        if str(SCRIPT_DIR) not in sys.path:
+            sys.path.insert(0, str(SCRIPT_DIR))
+        import test_converter
         
-        print(result.stdout)
-        if result.stderr:
-            print("Errors:")
-            print(result.stderr)
+        # The tests use paths relative to the script directory
+        os.chdir(SCRIPT_DIR)
+        passed = test_converter.main(cleanup=False)  # Don't clean up files automatically
         
-        if result.returncode == 0:
+        if passed:
             print("✅ All converter tests passed!")
             return True
         else:
-            print(f"❌ Some converter tests failed (exit code: {result.returncode})")
+            print("❌ Some converter tests failed")
             return False
             
     except Exception as e:
         print(f"❌ Failed to run converter tests: {e}")
         return False
+    finally:
+        os.chdir(original_cwd)
 
 
 def show_usage_examples():
@@ -207,8 +251,13 @@ def show_usage_examples():
     print("   - modern: Contemporary design")
 
 
-def main():
-    """Main installation and testing routine."""
+def main(full=False, assume_yes=False):
+    """Main installation and testing routine.
+    
+    Args:
+        full: Render a test PDF when checking WeasyPrint
+        assume_yes: Install dependencies and run the tests without asking
+    """
     print("Markdown to PDF Converter - Installation & Test")
     print("=" * 50)
     
@@ -217,10 +266,8 @@ def main():
         return False
     
     # Step 2: Install dependencies
-    print("\nWould you like to install/update dependencies? (y/n): ", end="")
     try:
-        response = input().lower().strip()
-        if response in ['y', 'yes']:
+        if ask_yes_no("Would you like to install/update dependencies?", assume_yes):
             if not install_dependencies():
                 print("\n⚠️  Installation failed. You can try manually:")
                 print("   pip install -r requirements.txt")
@@ -235,15 +282,13 @@ def main():
         return False
     
     # Step 4: Test WeasyPrint specifically
-    if not test_weasyprint():
+    if not test_weasyprint(full=full):
         print("\n⚠️  WeasyPrint is not working properly.")
         return False
     
     # Step 5: Run converter tests
-    print("\nWould you like to run the test suite? (y/n): ", end="")
     try:
-        response = input().lower().strip()
-        if response in ['y', 'yes']:
+        if ask_yes_no("Would you like to run the test suite?", assume_yes):
             if not run_converter_tests():
                 print("\n⚠️  Some tests failed. The converter might not work properly.")
                 return False
@@ -267,7 +312,7 @@ def main():
 
 if __name__ == "__main__":
     try:
-        success = main()
+        success = main(full="--full" in sys.argv[1:], assume_yes="--yes" in sys.argv[1:])
         if not success:
             print("\n❌ Installation/testing completed with issues.")
             print("Please check the errors above and try again.")
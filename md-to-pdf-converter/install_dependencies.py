@@ -4,46 +4,99 @@ Installation helper script for md-to-pdf-converter.
 This script installs Python dependencies and provides guidance for system dependencies.
 """
 
+import json
+import os
 import subprocess
 import sys
 import platform
+import tempfile
 from pathlib import Path
 
+# Operating system name, looked up once
+SYSTEM = platform.system()
+
+# Install instructions for the native libraries WeasyPrint needs, by OS
+SYSTEM_DEPENDENCY_HELP = {
+    "Windows": (
+        "\n⚠️  Windows users need to install GTK3 runtime:\n"
+        "   1. Download from: https://github.com/tschoonj/GTK-for-Windows-Runtime-Environment-Installer\n"
+        "   2. Run the installer and follow the setup wizard\n"
+        "   3. Restart your terminal after installation"
+    ),
+    "Darwin": (  # macOS
+        "\n⚠️  macOS users need to install system libraries:\n"
+        "   brew install cairo pango gdk-pixbuf libffi"
+    ),
+    "Linux": (
+        "\n⚠️  Linux users need to install system libraries:\n"
+        "   Ubuntu/Debian:\n"
+        "   sudo apt-get install build-essential python3-dev python3-pip\n"
+        "   sudo apt-get install libcairo2 libpango-1.0-0 libpangocairo-1.0-0 libgdk-pixbuf2.0-0 libffi-dev shared-mime-info\n"
+        "\n   Fedora/RHEL:\n"
+        "   sudo dnf install cairo pango gdk-pixbuf2 libffi\n"
+        "\n   Arch Linux:\n"
+        "   sudo pacman -S cairo pango gdk-pixbuf2 libffi"
+    ),
+}
+
+# First pip release that supports "pip install --report"
+PIP_REPORT_VERSION = (22, 2)
+
+def pip_supports_report():
+    """Check whether the installed pip can write an installation report."""
+    try:
+        from pip import __version__ as pip_version
+        return tuple(int(part) for part in pip_version.split(".")[:2]) >= PIP_REPORT_VERSION
+    except (ImportError, ValueError):
+        return False
+
+def print_installation_report(report_path):
+    """Print the packages listed in a pip installation report."""
+    try:
+        report = json.loads(Path(report_path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return
+    
+    installed = [item["metadata"] for item in report.get("install", [])]
+    if installed:
+        print("   Installed: " + ", ".join(f"{meta['name']} {meta['version']}" for meta in installed))
+    else:
+        print("   All requirements were already satisfied.")
+
 def install_python_dependencies():
     """Install all Python dependencies from requirements.txt."""
     print("📦 Installing Python dependencies...")
+    command = [sys.executable, "-m", "pip", "install", "-r", "requirements.txt"]
+    
+    # Have the same pip run report what it installed, rather than querying
+    # each package with another pip invocation afterwards
+    report_path = None
+    if pip_supports_report():
+        fd, report_path = tempfile.mkstemp(suffix=".json")
+        os.close(fd)
+        command += ["--report", report_path]
+    
     try:
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"])
+        # close_fds=False lets CPython < 3.13 start pip with posix_spawn()
+        subprocess.check_call(command, close_fds=False)
         print("✅ Python dependencies installed successfully!")
+        if report_path:
+            print_installation_report(report_path)
         return True
     except subprocess.CalledProcessError as e:
         print(f"❌ Failed to install Python dependencies: {e}")
         return False
+    finally:
+        if report_path:
+            os.remove(report_path)
 
 def check_system_dependencies():
     """Check and provide guidance for system dependencies."""
-    system = platform.system()
-    print(f"🔍 Detected operating system: {system}")
+    print(f"🔍 Detected operating system: {SYSTEM}")
     
-    if system == "Windows":
-        print("\n⚠️  Windows users need to install GTK3 runtime:")
-        print("   1. Download from: https://github.com/tschoonj/GTK-for-Windows-Runtime-Environment-Installer")
-        print("   2. Run the installer and follow the setup wizard")
-        print("   3. Restart your terminal after installation")
-        
-    elif system == "Darwin":  # macOS
-        print("\n⚠️  macOS users need to install system libraries:")
-        print("   brew install cairo pango gdk-pixbuf libffi")
-        
-    elif system == "Linux":
-        print("\n⚠️  Linux users need to install system libraries:")
-        print("   Ubuntu/Debian:")
-        print("   sudo apt-get install build-essential python3-dev python3-pip")
-        print("   sudo apt-get install libcairo2 libpango-1.0-0 libpangocairo-1.0-0 libgdk-pixbuf2.0-0 libffi-dev shared-mime-info")
-        print("\n   Fedora/RHEL:")
-        print("   sudo dnf install cairo pango gdk-pixbuf2 libffi")
-        print("\n   Arch Linux:")
-        print("   sudo pacman -S cairo pango gdk-pixbuf2 libffi")
+    help_text = SYSTEM_DEPENDENCY_HELP.get(SYSTEM)
+    if help_text:
+        print(help_text)
 
 def verify_installation():
     """Verify that the converter is ready to use."""
@@ -35,6 +35,9 @@ setup(
         "click>=8.0.0",
         "colorama>=0.4.4",
     ],
+    extras_require={
+        "cmark": ["cmarkgfm>=2022.10.27"],
+    },
     entry_points={
         "console_scripts": [
             "md2pdf=cli.main:cli",
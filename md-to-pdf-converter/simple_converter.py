@@ -10,7 +10,107 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak
 from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_JUSTIFY
+import html
 import re
+from html.parser import HTMLParser
+
+# Bold or italic markdown emphasis, matched in one pass by _format_text
+_EMPHASIS_RE = re.compile(r'\*\*(?P<bold>.*?)\*\*|\*(?P<italic>.*?)\*')
+
+
+def _emphasis_to_markup(match):
+    """Replace an emphasis match with the equivalent ReportLab markup."""
+    bold = match.group('bold')
+    if bold is not None:
+        return f'<b>{bold}</b>'
+    return f'<i>{match.group("italic")}</i>'
+
+
+# Block elements that become paragraphs: style name, spacer height, text prefix
+_BLOCK_STYLES = {
+    'h1': ('CustomHeading1', 12, ''),
+    'h2': ('CustomHeading2', 10, ''),
+    'h3': ('CustomHeading3', 8, ''),
+    'p': ('CustomNormal', 6, ''),
+    'li': ('CustomBullet', 4, '• '),
+}
+
+# Inline elements kept as ReportLab paragraph markup
+_INLINE_MARKUP = {
+    'strong': ('<b>', '</b>'),
+    'b': ('<b>', '</b>'),
+    'em': ('<i>', '</i>'),
+    'i': ('<i>', '</i>'),
+    'code': ('<font face="Courier">', '</font>'),
+}
+
+
+class _StoryBuilder(HTMLParser):
+    """Builds ReportLab flowables from markdown2 HTML in a single parsing pass."""
+    
+    def __init__(self, styles, format_text):
+        super().__init__()
+        self.styles = styles
+        self.format_text = format_text
+        self.story = []
+        self._block = None
+        self._buffer = []
+        self._code_depth = 0
+    
+    def handle_starttag(self, tag, attrs):
+        if tag in _BLOCK_STYLES:
+            # Paragraphs inside list items belong to the item
+            if tag == 'p' and self._block == 'li':
+                return
+            # A nested block (e.g. a sub-list item) ends the text collected so far
+            self._flush()
+            self._block = tag
+        elif self._block and tag in _INLINE_MARKUP:
+            if tag == 'code':
+                self._code_depth += 1
+            self._buffer.append(_INLINE_MARKUP[tag][0])
+        elif self._block and tag == 'br':
+            self._buffer.append('<br/>')
+    
+    def handle_endtag(self, tag):
+        if tag in _BLOCK_STYLES:
+            if tag == 'p' and self._block == 'li':
+                self._buffer.append(' ')
+                return
+            self._flush()
+            self._block = None
+        elif self._block and tag in _INLINE_MARKUP:
+            if tag == 'code' and self._code_depth:
+                self._code_depth -= 1
+            self._buffer.append(_INLINE_MARKUP[tag][1])
+    
+    def handle_data(self, data):
+        # Text outside the handled blocks (code blocks, tables) is skipped
+        if not self._block:
+            return
+        text = html.escape(data, quote=False)
+        # Leftover asterisk emphasis is converted per text chunk, so the
+        # generated tags never straddle the inline markup; code is literal
+        if self._block in ('p', 'li') and not self._code_depth:
+            text = self.format_text(text)
+        self._buffer.append(text)
+    
+    def _flush(self):
+        """Append the current block to the story if it has any text."""
+        if not self._block:
+            return
+        text = ''.join(self._buffer).strip()
+        self._buffer = []
+        self._code_depth = 0
+        if not text:
+            return
+        
+        style_name, spacing, prefix = _BLOCK_STYLES[self._block]
+        # Each block adds its paragraph and trailing spacer together
+        self.story.extend((
+            Paragraph(prefix + text, self.styles[style_name]),
+            Spacer(1, spacing),
+        ))
 
 
 class SimpleMarkdownToPDF:
@@ -88,12 +188,7 @@ class SimpleMarkdownToPDF:
     
     def convert_markdown_to_pdf(self, markdown_file, output_pdf):
         """Convert markdown file to PDF."""
-        # Read markdown content
-        with open(markdown_file, 'r', encoding='utf-8') as f:
-            markdown_content = f.read()
-        
-        # Convert markdown to HTML
-        html_content = markdown2.markdown(markdown_content, extras=['fenced-code-blocks', 'tables'])
+        story = self._build_story(markdown_file)
         
         # Create PDF document
         doc = SimpleDocTemplate(
@@ -105,60 +200,36 @@ class SimpleMarkdownToPDF:
             bottomMargin=18
         )
         
-        # Build story (content)
-        story = []
-        
-        # Process the HTML content line by line
-        lines = html_content.split('\n')
-        
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-                
-            # Process headings
-            if line.startswith('<h1>'):
-                text = re.sub(r'<[^>]+>', '', line)
-                story.append(Paragraph(text, self.styles['CustomHeading1']))
-                story.append(Spacer(1, 12))
-            elif line.startswith('<h2>'):
-                text = re.sub(r'<[^>]+>', '', line)
-                story.append(Paragraph(text, self.styles['CustomHeading2']))
-                story.append(Spacer(1, 10))
-            elif line.startswith('<h3>'):
-                text = re.sub(r'<[^>]+>', '', line)
-                story.append(Paragraph(text, self.styles['CustomHeading3']))
-                story.append(Spacer(1, 8))
-            elif line.startswith('<p>'):
-                text = re.sub(r'<[^>]+>', '', line)
-                if text:
-                    # Handle bold and italic text
-                    text = self._format_text(text)
-                    story.append(Paragraph(text, self.styles['CustomNormal']))
-                    story.append(Spacer(1, 6))
-            elif line.startswith('<ul>'):
-                # Process list items
-                list_items = re.findall(r'<li>(.*?)</li>', line)
-                for item in list_items:
-                    item = self._format_text(item)
-                    story.append(Paragraph(f'• {item}', self.styles['CustomBullet']))
-                    story.append(Spacer(1, 4))
-            elif line.startswith('<strong>'):
-                text = re.sub(r'<[^>]+>', '', line)
-                formatted_text = f'<b>{text}</b>'
-                story.append(Paragraph(formatted_text, self.styles['CustomNormal']))
-                story.append(Spacer(1, 6))
-        
         # Build PDF
         doc.build(story)
         return output_pdf
     
+    def _build_story(self, markdown_file):
+        """Build the story (content) for a markdown file.
+        
+        The markdown source and the intermediate HTML only live inside this
+        method, so they are released before ReportLab lays out the PDF.
+        """
+        # Read markdown content
+        markdown_content = Path(markdown_file).read_text(encoding='utf-8')
+        
+        # Convert markdown to HTML
+        html_content = markdown2.markdown(markdown_content, extras=['fenced-code-blocks', 'tables'])
+        
+        # Stream the HTML through the parser in one pass; no list of lines is built
+        builder = _StoryBuilder(self.styles, self._format_text)
+        builder.feed(html_content)
+        builder.close()
+        return builder.story
+    
     def _format_text(self, text):
         """Format text with basic HTML tags for ReportLab."""
-        # Convert basic markdown-like formatting to HTML
-        text = re.sub(r'\*\*(.*?)\*\*', r'<b>\1</b>', text)  # Bold
-        text = re.sub(r'\*(.*?)\*', r'<i>\1</i>', text)      # Italic
-        return text
+        # markdown2 has usually converted the emphasis already
+        if '*' not in text:
+            return text
+        
+        # Convert basic markdown-like formatting (bold, italic) to HTML
+        return _EMPHASIS_RE.sub(_emphasis_to_markup, text)
 
 
 def main():
@@ -2,21 +2,45 @@
 """Test script for the markdown to PDF converter."""
 
 import os
+import re
 import sys
+from functools import lru_cache
 from pathlib import Path
 
 # Add the current directory to the path
 sys.path.insert(0, str(Path(__file__).parent))
 
+from weasyprint import HTML
+
 from core.converter import MarkdownToPDFConverter
 from core.exceptions import ConverterError
+from core.styling import StyleManager, ThemeManager
+from core.utils import extract_metadata
+
+
+@lru_cache(maxsize=1)
+def _get_converter():
+    """Get the converter shared by all tests, creating it on first use."""
+    return MarkdownToPDFConverter()
+
+
+# Available themes, looked up once without building a full converter
+_THEMES = ThemeManager(StyleManager()).list_themes()
+
+
+def _file_size(path):
+    """Get the size of a file in bytes, or None if it does not exist."""
+    try:
+        return Path(path).stat().st_size
+    except OSError:
+        return None
 
 
 def test_basic_conversion():
     """Test basic markdown to PDF conversion."""
     print("Testing basic conversion...")
     
-    converter = MarkdownToPDFConverter()
+    converter = _get_converter()
     
     # Test markdown content
     test_markdown = """
@@ -49,9 +73,9 @@ That's all!
             title="Test Document"
         )
         
-        if os.path.exists(output_path):
+        file_size = _file_size(output_path)
+        if file_size is not None:
             print(f"✅ Basic conversion successful: {output_path}")
-            file_size = os.path.getsize(output_path)
             print(f"   File size: {file_size:,} bytes")
             return True
         else:
@@ -67,8 +91,8 @@ def test_themes():
     """Test different themes."""
     print("\nTesting themes...")
     
-    converter = MarkdownToPDFConverter()
-    themes = converter.get_available_themes()
+    converter = _get_converter()
+    themes = _THEMES
     
     print(f"Available themes: {list(themes.keys())}")
     
@@ -85,7 +109,7 @@ def test_themes():
                 theme=theme_name
             )
             
-            if os.path.exists(output_path):
+            if _file_size(output_path) is not None:
                 print(f"✅ Theme '{theme_name}' works")
                 success_count += 1
             else:
@@ -106,7 +130,7 @@ def test_file_conversion():
         print(f"❌ Sample file not found: {sample_file}")
         return False
     
-    converter = MarkdownToPDFConverter()
+    converter = _get_converter()
     
     try:
         output_path = converter.convert_file(
@@ -115,9 +139,9 @@ def test_file_conversion():
             theme="default"
         )
         
-        if os.path.exists(output_path):
+        file_size = _file_size(output_path)
+        if file_size is not None:
             print(f"✅ File conversion successful: {output_path}")
-            file_size = os.path.getsize(output_path)
             print(f"   File size: {file_size:,} bytes")
             return True
         else:
@@ -133,7 +157,7 @@ def test_html_preview():
     """Test HTML preview generation."""
     print("\nTesting HTML preview...")
     
-    converter = MarkdownToPDFConverter()
+    converter = _get_converter()
     
     test_markdown = """
 # Preview Test
@@ -154,7 +178,7 @@ print("Hello from preview!")
         with open("test_preview.html", "w", encoding="utf-8") as f:
             f.write(html_content)
         
-        if os.path.exists("test_preview.html"):
+        if _file_size("test_preview.html") is not None:
             print("✅ HTML preview generation successful: test_preview.html")
             return True
         else:
@@ -170,7 +194,7 @@ def test_custom_css():
     """Test custom CSS functionality."""
     print("\nTesting custom CSS...")
     
-    converter = MarkdownToPDFConverter()
+    converter = _get_converter()
     
     custom_css = """
     h1 {
@@ -193,7 +217,7 @@ def test_custom_css():
             custom_css=custom_css
         )
         
-        if os.path.exists(output_path):
+        if _file_size(output_path) is not None:
             print(f"✅ Custom CSS test successful: {output_path}")
             return True
         else:
@@ -205,33 +229,203 @@ def test_custom_css():
         return False
 
 
+def test_merged_conversion():
+    """Test merging several markdown files into one PDF."""
+    print("\nTesting merged conversion...")
+    
+    converter = _get_converter()
+    
+    # Both documents use the same heading and footnote ids
+    markdown_files = ["test_merge_a.md", "test_merge_b.md"]
+    Path(markdown_files[0]).write_text("# Intro\n\nFirst document[^1].\n\n[^1]: Note A", encoding="utf-8")
+    Path(markdown_files[1]).write_text("# Intro\n\nSecond document[^1].\n\n[^1]: Note B", encoding="utf-8")
+    
+    try:
+        merged_html = converter._build_merged_html(markdown_files)
+        ids = re.findall(r'\sid="([^"]*)"', merged_html)
+        if len(ids) != len(set(ids)):
+            print(f"❌ Merged conversion failed: duplicate ids in {ids}")
+            return False
+        
+        # Each short document must start on its own page, with no blank page
+        # from the theme's h1 page break
+        page_count = len(HTML(string=merged_html).render(
+            stylesheets=[converter._get_stylesheet('default')],
+            font_config=converter.font_config
+        ).pages)
+        if page_count != len(markdown_files):
+            print(f"❌ Merged conversion failed: expected {len(markdown_files)} pages, got {page_count}")
+            return False
+        
+        output_path = converter.convert_files(markdown_files, "test_merged.pdf")
+        if _file_size(output_path) is None:
+            print("❌ Merged conversion failed: Output file not created")
+            return False
+        print(f"✅ Merged conversion successful: {output_path} ({page_count} pages)")
+        
+        # The same merge through batch_from_list's MERGE_OUTPUT setting
+        import batch_from_list
+        Path("test_merge_list.txt").write_text("\n".join(markdown_files), encoding="utf-8")
+        saved_settings = batch_from_list.LIST_FILE, batch_from_list.MERGE_OUTPUT
+        batch_from_list.LIST_FILE = Path("test_merge_list.txt")
+        batch_from_list.MERGE_OUTPUT = "test_merged_list.pdf"
+        try:
+            batch_from_list.main()
+        finally:
+            batch_from_list.LIST_FILE, batch_from_list.MERGE_OUTPUT = saved_settings
+        
+        if _file_size("test_merged_list.pdf") is not None:
+            print("✅ Merged list conversion successful: test_merged_list.pdf")
+            return True
+        else:
+            print("❌ Merged list conversion failed: Output file not created")
+            return False
+            
+    except Exception as e:
+        print(f"❌ Merged conversion failed: {e}")
+        return False
+
+
+def test_cmark_engine():
+    """Test conversion with the optional cmark-gfm engine."""
+    print("\nTesting cmark engine...")
+    
+    try:
+        import cmarkgfm  # noqa: F401
+    except ImportError:
+        print("⚠️  cmark engine test skipped: cmarkgfm is not installed")
+        return True
+    
+    test_markdown = "# Cmark Test\n\n| Column 1 | Column 2 |\n|---|---|\n| ~~old~~ | new |\n"
+    
+    try:
+        converter = MarkdownToPDFConverter(font_config=_get_converter().font_config, engine='cmark')
+        
+        # The table and strikethrough come from cmark's GFM extensions
+        html_content = converter.html_processor.convert_markdown_to_html(test_markdown)
+        if "<table>" not in html_content or "<del>old</del>" not in html_content:
+            print(f"❌ cmark engine test failed: unexpected HTML {html_content!r}")
+            return False
+        
+        output_path = converter.convert_string(
+            markdown_content=test_markdown,
+            output_pdf_path="test_cmark.pdf",
+            title="Cmark Test"
+        )
+        
+        if _file_size(output_path) is not None:
+            print(f"✅ cmark engine test successful: {output_path}")
+            return True
+        else:
+            print("❌ cmark engine test failed: Output file not created")
+            return False
+            
+    except Exception as e:
+        print(f"❌ cmark engine test failed: {e}")
+        return False
+
+
+def test_metadata():
+    """Test frontmatter detection and metadata extraction."""
+    print("\nTesting metadata...")
+    
+    frontmatter = "---\ntitle: Metadata Test\nauthor: Tester\n---\n# Heading\n"
+    checks = [
+        ("frontmatter is extracted",
+         extract_metadata(frontmatter) == {"title": "Metadata Test", "author": "Tester"}),
+        # Metadata must open on the first line; a leading blank line means none
+        ("leading blank line is not metadata",
+         extract_metadata("\n" + frontmatter) == {}),
+        ("unterminated frontmatter is ignored",
+         extract_metadata("---\ntitle: Open\n# Heading\n") == {}),
+        # The markdown2 metadata extra is still applied after leading whitespace
+        ("padded frontmatter is detected",
+         _get_converter().html_processor._has_metadata_section("\n  " + frontmatter)),
+    ]
+    
+    failed = [name for name, passed in checks if not passed]
+    if failed:
+        print(f"❌ Metadata test failed: {', '.join(failed)}")
+        return False
+    print("✅ Metadata extraction works")
+    return True
+
+
+def test_simple_converter():
+    """Test the ReportLab converter with asterisks next to code spans."""
+    print("\nTesting simple converter...")
+    
+    try:
+        from simple_converter import SimpleMarkdownToPDF
+    except ImportError as e:
+        print(f"⚠️  Simple converter test skipped: {e}")
+        return True
+    
+    # Asterisks in and around code spans used to produce mis-nested markup
+    cases = [
+        ("test_simple_globs", "Use `*` and `*.md` globs."),
+        ("test_simple_product", "Compute 2 * 3 and `a*b`."),
+    ]
+    
+    success = True
+    for name, markdown_content in cases:
+        try:
+            Path(f"{name}.md").write_text(markdown_content, encoding="utf-8")
+            output_path = SimpleMarkdownToPDF().convert_markdown_to_pdf(f"{name}.md", f"{name}.pdf")
+            
+            if _file_size(output_path) is not None:
+                print(f"✅ Simple conversion successful: {markdown_content!r}")
+            else:
+                print(f"❌ Simple conversion failed: {markdown_content!r} produced no output file")
+                success = False
+                
+        except Exception as e:
+            print(f"❌ Simple conversion failed for {markdown_content!r}: {e}")
+            success = False
+    
+    return success
+
+
 def cleanup_test_files():
     """Clean up test output files."""
     test_files = [
         "test_output.pdf",
         "test_preview.html",
         "test_custom_css.pdf",
-        "sample_output.pdf"
+        "sample_output.pdf",
+        "test_merge_a.md",
+        "test_merge_b.md",
+        "test_merge_list.txt",
+        "test_merged.pdf",
+        "test_merged_list.pdf",
+        "test_cmark.pdf",
+        "test_simple_globs.md",
+        "test_simple_globs.pdf",
+        "test_simple_product.md",
+        "test_simple_product.pdf"
     ]
     
     # Add theme test files
-    converter = MarkdownToPDFConverter()
-    themes = converter.get_available_themes()
-    for theme_name in themes.keys():
+    for theme_name in _THEMES:
         test_files.append(f"test_theme_{theme_name}.pdf")
     
     print("\nCleaning up test files...")
     for file_path in test_files:
-        if os.path.exists(file_path):
-            try:
-                os.remove(file_path)
-                print(f"   Removed: {file_path}")
-            except Exception as e:
-                print(f"   Failed to remove {file_path}: {e}")
+        try:
+            os.remove(file_path)
+            print(f"   Removed: {file_path}")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"   Failed to remove {file_path}: {e}")
 
 
-def main():
-    """Run all tests."""
+def main(cleanup=None):
+    """Run all tests.
+    
+    Args:
+        cleanup: Whether to remove the test files afterwards; None asks the user
+    """
     print("Markdown to PDF Converter - Test Suite")
     print("=" * 40)
     
@@ -241,6 +435,10 @@ def main():
         ("File Conversion", test_file_conversion),
         ("HTML Preview", test_html_preview),
         ("Custom CSS", test_custom_css),
+        ("Merged Conversion", test_merged_conversion),
+        ("Metadata", test_metadata),
+        ("Cmark Engine", test_cmark_engine),
+        ("Simple Converter", test_simple_converter),
     ]
     
     passed = 0
@@ -260,12 +458,14 @@ def main():
         print(f"⚠️  {total - passed} test(s) failed. Please check the errors above.")
     
     # Ask user if they want to clean up test files
-    try:
-        response = input("\nClean up test files? (y/n): ").lower().strip()
-        if response in ['y', 'yes']:
-            cleanup_test_files()
-    except KeyboardInterrupt:
-        print("\nTest completed.")
+    if cleanup is None:
+        try:
+            response = input("\nClean up test files? (y/n): ").lower().strip()
+            cleanup = response in ['y', 'yes']
+        except KeyboardInterrupt:
+            print("\nTest completed.")
+    if cleanup:
+        cleanup_test_files()
     
     return passed == total
 